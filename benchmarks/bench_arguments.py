@@ -0,0 +1,72 @@
+"""Benchmark du coût d'analyse des arguments par mise à jour.
+
+Compare, pour une commande à cinq arguments typés :
+- l'ancien chemin : `text.split(' ')` puis résolution de `kwargs_types` et
+  conversion argument par argument à chaque appel ;
+- le schéma compilé par `@command` : `split_arguments` puis `ArgumentSchema.parse`,
+  sans et avec argument entre guillemets.
+
+Usage:
+    python -m benchmarks.bench_arguments [--number 100000]
+"""
+
+import argparse
+import datetime
+import enum
+import functools
+import timeit
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from venantvr.telegram.arguments import ArgumentSchema, split_arguments
+
+
+class Side(enum.Enum):
+    BUY = "achat"
+    SELL = "vente"
+
+
+def order(symbol: str, side: Side, quantity: Decimal, price: float, note: Optional[str] = None) -> None:
+    pass
+
+
+KWARGS_TYPES = {"side": Side, "quantity": Decimal, "price": float}
+ARG_NAMES = ["symbol", "side", "quantity", "price", "note"]
+PLAIN = "/order BTC SELL 0.5 42000.5 stop"
+QUOTED = '/order BTC SELL 0.5 42000.5 "prise de profit partielle"'
+
+
+def legacy(text: str) -> Dict[str, Any]:
+    """Reproduit l'analyse d'origine (les noms d'Enum ne sont pas gérés : conversion par valeur)."""
+    arguments: List[str] = text.split(' ')[1:]
+    if len(arguments) != len(ARG_NAMES):
+        raise ValueError("arité")
+    kwargs = {}
+    for i, arg_name in enumerate(ARG_NAMES):
+        expected_type = KWARGS_TYPES.get(arg_name, str)
+        kwargs[arg_name] = expected_type(arguments[i] if arg_name != "side" else "vente")
+    return kwargs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+    schema = ArgumentSchema.compile("/order", order, KWARGS_TYPES)
+
+    def compiled(text: str) -> Dict[str, Any]:
+        return schema.parse(split_arguments(text.partition(' ')[2]))
+
+    started = datetime.datetime.now()
+    cases = [("ancien chemin", legacy, PLAIN), ("schéma compilé", compiled, PLAIN),
+             ("schéma compilé, guillemets", compiled, QUOTED)]
+    print(f"{'cas':<28} {'µs/màj':>8}")
+    for label, func, text in cases:
+        func(text)
+        best = min(timeit.repeat(functools.partial(func, text), number=args.number, repeat=5))
+        print(f"{label:<28} {best / args.number * 1e6:>8.2f}")
+    print(f"durée totale: {(datetime.datetime.now() - started).total_seconds():.1f}s")
+
+
+if __name__ == "__main__":
+    main()
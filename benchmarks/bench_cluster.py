@@ -0,0 +1,99 @@
+"""Benchmark de montée en charge multi-processus sur des handlers CPU-bound.
+
+Compare le débit de traitement d'un `ProcessCluster` selon son nombre de
+processus de traitement. L'API Telegram est simulée et la limite de débit
+d'envoi désactivée : seul le coût de traitement est mesuré.
+
+Usage:
+    python -m benchmarks.bench_cluster [--updates 400] [--work 200000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List
+
+from venantvr.telegram.cluster import ProcessCluster
+from venantvr.telegram.decorators import command
+from venantvr.telegram.handler import TelegramHandler
+from venantvr.telegram.ratelimit import RateLimiter
+
+
+class CpuHandler(TelegramHandler):
+    @command(name="/crunch", description="Calcul CPU-bound", kwargs_types={"n": int})
+    def crunch(self, n: int) -> Dict[str, str]:
+        total = 0
+        for i in range(n):
+            total += i * i
+        return {"text": str(total)}
+
+
+class CountingSession:
+    """Session HTTP factice qui compte les envois."""
+
+    def __init__(self, expected: int) -> None:
+        self.expected = expected
+        self.sent = 0
+        self.done = threading.Event()
+
+    status_code = 200
+
+    def post(self, *args, **kwargs) -> "CountingSession":
+        self.sent += 1
+        if self.sent >= self.expected:
+            self.done.set()
+        return self
+
+    @staticmethod
+    def json() -> Dict:
+        return {"ok": True}
+
+    def close(self) -> None:
+        pass
+
+
+def run(workers: int, updates: int, work: int) -> float:
+    """Retourne le nombre de mises à jour traitées par seconde."""
+    cluster = ProcessCluster("0:BENCH", "0", [CpuHandler], workers=workers)
+    session = CountingSession(updates)
+    cluster.session = session
+    cluster.bot.rate_limiter = RateLimiter(rate=0)
+    cluster.start(poll=False)
+    # Préchauffage : chaque processus traite une mise à jour avant la mesure
+    warmup = CountingSession(workers)
+    cluster.bot._session = warmup  # type: ignore[assignment]
+    for chat_id in range(workers):
+        message = {"text": "/crunch 1", "chat": {"id": chat_id}, "date": time.time()}
+        cluster.feed_update({"update_id": 0, "message": message})
+    warmup.done.wait(60)
+    cluster.bot._session = session  # type: ignore[assignment]
+
+    started = time.perf_counter()
+    for update_id in range(updates):
+        cluster.feed_update({"update_id": update_id, "message": {"text": f"/crunch {work}", "chat": {"id": update_id},
+                                                                 "date": time.time()}})
+    session.done.wait()
+    elapsed = time.perf_counter() - started
+    cluster.stop(timeout=10)
+    return updates / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=400)
+    parser.add_argument("--work", type=int, default=200000, help="itérations par appel de handler")
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    counts: List[int] = args.workers or sorted({1, 2, 4, os.cpu_count() or 1})
+
+    baseline = None
+    print(f"{'processus':>10} {'màj/s':>10} {'accélération':>13}")
+    for workers in counts:
+        throughput = run(workers, args.updates, args.work)
+        baseline = baseline or throughput
+        print(f"{workers:>10} {throughput:>10.1f} {throughput / baseline:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
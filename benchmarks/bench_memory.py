@@ -0,0 +1,121 @@
+"""Benchmark mémoire du registre, des membres d'enum et des prompts.
+
+Mesure avec tracemalloc, pour des dizaines de milliers de commandes et de
+chats, la mémoire occupée par :
+- les entrées du registre : `CommandSpec` contre les anciens dicts ;
+- les membres d'enum : `DynamicEnumMember` à `__slots__` contre un objet à `__dict__` ;
+- les prompts en cours : `PromptState` contre les anciens dicts ;
+- les recherches de valeurs inconnues : `from_value` ne crée plus de membre.
+
+Les valeurs de commande sont internées une fois à leur déclaration, hors mesure.
+Dans les prompts, l'ancien code conservait le nom de commande découpé dans
+chaque message ; `PromptState` référence la chaîne du registre.
+
+Usage:
+    python -m benchmarks.bench_memory [--commands 20000] [--chats 50000]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from venantvr.telegram.arguments import ArgumentSchema
+from venantvr.telegram.classes.command import Command
+from venantvr.telegram.classes.enums import DynamicEnum, DynamicEnumMember
+from venantvr.telegram.classes.types import PromptState
+from venantvr.telegram.decorators import CommandSpec
+
+
+class LegacyMember:
+    """Membre d'enum sans `__slots__`, comme avant."""
+
+    def __init__(self, name: str, value: str, parent_enum: type) -> None:
+        self.name = name
+        self.value = value
+        self.parent_enum = parent_enum
+
+
+class BenchEnum(DynamicEnum):
+    pass
+
+
+def measure(build: Callable[[], Any]) -> float:
+    """Retourne la mémoire (Kio) allouée et conservée par `build()`."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / 1024
+
+
+def action(symbol: str, quantity: float) -> Dict[str, str]:
+    return {"text": f"{symbol} {quantity}"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=20000)
+    parser.add_argument("--chats", type=int, default=50000)
+    args = parser.parse_args()
+
+    names = [sys.intern(f"/cmd{i}") for i in range(args.commands)]
+    schema = ArgumentSchema.compile("/cmd", action, {"quantity": float})
+    enum_member = Command.define("/bench_command")
+    fields = {"action": action, "enum": enum_member, "schema": schema, "kwargs_types": {"quantity": float},
+              "menu": None, "description": "Commande de test", "debounce": None, "max_age": None, "batch": None,
+              "batch_window": None}
+
+    def legacy_registry() -> Dict[str, dict]:
+        return {name: dict(fields, name=name, arg_names=["symbol", "quantity"], asks=["Symbole ?", "Quantité ?"])
+                for name in names}
+
+    def spec_registry() -> Dict[str, CommandSpec]:
+        return {name: CommandSpec(name=name, arg_names=("symbol", "quantity"), asks=("Symbole ?", "Quantité ?"),
+                                  **fields) for name in names}
+
+    def legacy_members() -> List[LegacyMember]:
+        return [LegacyMember(name.lstrip("/").upper(), name, BenchEnum) for name in names]
+
+    def slotted_members() -> List[DynamicEnumMember]:
+        return [DynamicEnumMember(name.lstrip("/").upper(), name, BenchEnum) for name in names]
+
+    texts = [f"/bench_command {chat_id}" for chat_id in range(args.chats)]
+    registered_name = enum_member.value
+
+    def legacy_prompts() -> Dict[str, dict]:
+        return {str(chat_id): {"command": text.split(' ')[0], "arguments": []} for chat_id, text in enumerate(texts)}
+
+    def slotted_prompts() -> Dict[str, PromptState]:
+        return {str(chat_id): PromptState(registered_name) for chat_id, _ in enumerate(texts)}
+
+    def legacy_unknown_lookups() -> Dict[str, LegacyMember]:
+        # Ancien `from_value` : chaque valeur inconnue devenait un membre permanent
+        value_map: Dict[str, LegacyMember] = {}
+        for chat_id in range(args.chats):
+            value = f"/spam{chat_id}"
+            value_map.setdefault(value, LegacyMember(value.lstrip("/").upper(), value, BenchEnum))
+        return value_map
+
+    def unknown_lookups() -> Dict[str, DynamicEnumMember]:
+        for chat_id in range(args.chats):
+            BenchEnum.from_value(f"/spam{chat_id}")
+        return BenchEnum._value_map
+
+    rows = [
+        (f"registre ({args.commands} commandes)", legacy_registry, spec_registry),
+        (f"membres d'enum ({args.commands})", legacy_members, slotted_members),
+        (f"prompts ({args.chats} chats)", legacy_prompts, slotted_prompts),
+        (f"valeurs inconnues ({args.chats})", legacy_unknown_lookups, unknown_lookups),
+    ]
+    print(f"{'structure':<34} {'avant (Kio)':>12} {'après (Kio)':>12} {'gain':>7}")
+    for label, before, after in rows:
+        old, new = measure(before), measure(after)
+        print(f"{label:<34} {old:>12.0f} {new:>12.0f} {(1 - new / old) * 100:>6.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark du débit d'envoi avec et sans outbox persistante.
+
+Compare, contre une API simulée qui répond 200 immédiatement et sans limite de
+débit, le temps nécessaire pour mettre en file puis envoyer une rafale de
+messages :
+- par `outgoing_queue` (en mémoire) ;
+- par `SqliteOutbox`, avec écritures groupées (`batch_size` par défaut) ;
+- par `SqliteOutbox` avec une transaction par message (`batch_size=1`).
+
+Usage:
+    python -m benchmarks.bench_outbox [--messages 5000]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.config import Config
+from venantvr.telegram.outbox import SqliteOutbox
+from venantvr.telegram.ratelimit import RateLimiter
+
+
+class CountingSession:
+    """Session HTTP factice qui compte les envois."""
+
+    status_code = 200
+
+    def __init__(self, expected: int) -> None:
+        self.expected = expected
+        self.sent = 0
+        self.done = threading.Event()
+
+    def post(self, *args, **kwargs) -> "CountingSession":
+        self.sent += 1
+        if self.sent >= self.expected:
+            self.done.set()
+        return self
+
+    @staticmethod
+    def json() -> Dict:
+        return {"ok": True}
+
+
+def run(messages: int, outbox: Optional[SqliteOutbox]) -> Dict[str, float]:
+    """Retourne le débit de mise en file et le débit de bout en bout (messages/s)."""
+    bot = TelegramBot("0:BENCH", "0", outbox=outbox)
+    session = CountingSession(messages)
+    bot._session = session  # type: ignore[assignment]
+    bot.rate_limiter = RateLimiter(rate=0)
+    sender = threading.Thread(target=bot._outbox_sender if outbox else bot._sender, daemon=True)
+    sender.start()
+
+    started = time.perf_counter()
+    for i in range(messages):
+        bot.send_message({"chat_id": "0", "text": f"alerte {i}"})
+    enqueued = time.perf_counter() - started
+    session.done.wait()
+    elapsed = time.perf_counter() - started
+
+    bot._drain_event.set()
+    if outbox is not None:
+        outbox.wake()
+    bot.outgoing_queue.put(None)
+    sender.join()
+    return {"enqueue": messages / enqueued, "total": messages / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'chemin':<28} {'mise en file/s':>15} {'envoi/s':>10}")
+    result = run(args.messages, None)
+    print(f"{'mémoire':<28} {result['enqueue']:>15.0f} {result['total']:>10.0f}")
+    for batch_size in (Config.OUTBOX_BATCH_SIZE, 1):
+        with tempfile.TemporaryDirectory() as directory:
+            outbox = SqliteOutbox(os.path.join(directory, "outbox.db"), batch_size=batch_size)
+            result = run(args.messages, outbox)
+            outbox.close()
+        label = f"outbox (batch_size={batch_size})"
+        print(f"{label:<28} {result['enqueue']:>15.0f} {result['total']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark du temps de démarrage et d'arrêt d'un bot.
+
+Mesure, sans accès réseau :
+- l'import à froid du paquet dans un interpréteur neuf ;
+- la construction d'un `TelegramBot` ;
+- la création de la session HTTP (premier appel : import différé de `requests`) ;
+- un cycle `start()` / `stop()` complet, long poll compris, contre une API simulée
+  qui termine le `getUpdates` en attente dès qu'un autre arrive (comme Telegram).
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 20]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+IMPORT_SNIPPET = (
+    "import sys, time; t = time.perf_counter(); import venantvr.telegram; "
+    "print(time.perf_counter() - t, 'requests' in sys.modules)"
+)
+
+
+class FakeTelegramSession:
+    """Session simulant le long polling Telegram."""
+
+    def __init__(self) -> None:
+        self._released = threading.Event()
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None) -> "FakeTelegramSession":
+        if params and params.get("timeout"):
+            self._released.wait(30)
+            self._released.clear()
+        else:
+            self._released.set()
+        return self
+
+    status_code = 200
+
+    def post(self, *args, **kwargs) -> "FakeTelegramSession":
+        return self
+
+    @staticmethod
+    def raise_for_status() -> None:
+        pass
+
+    @staticmethod
+    def json() -> Dict:
+        return {"ok": True, "result": []}
+
+    def close(self) -> None:
+        pass
+
+
+def cold_import(runs: int) -> List[float]:
+    """Mesure l'import du paquet dans des interpréteurs neufs."""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True,
+                                check=True).stdout.split()
+        timings.append(float(output[0]))
+    print(f"requests importé à l'import du paquet : {output[1]}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    import_times = cold_import(args.runs)
+
+    from venantvr.telegram.bot import TelegramBot
+
+    started = time.perf_counter()
+    TelegramBot._create_session().close()
+    session_time = time.perf_counter() - started
+
+    construct_times = []
+    cycle_times = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        bot = TelegramBot("0:BENCH", "0")
+        construct_times.append(time.perf_counter() - started)
+        with patch.object(TelegramBot, "_create_session", return_value=FakeTelegramSession()):
+            started = time.perf_counter()
+            bot.start()
+            bot.send_message({"chat_id": "0", "text": "arrêt"})
+            bot.stop(timeout=5)
+            cycle_times.append(time.perf_counter() - started)
+
+    def ms(values: List[float]) -> str:
+        return f"médiane {statistics.median(values) * 1000:8.2f} ms, max {max(values) * 1000:8.2f} ms"
+
+    print(f"import à froid du paquet      : {ms(import_times)}")
+    print(f"construction de TelegramBot   : {ms(construct_times)}")
+    print(f"création de session (1er appel): {session_time * 1000:8.2f} ms")
+    print(f"cycle start() + stop()        : {ms(cycle_times)}")
+
+
+if __name__ == "__main__":
+    main()
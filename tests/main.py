@@ -18,7 +18,7 @@ if __name__ == "__main__":
         print("ERREUR : Impossible de trouver BOT_TOKEN ou CHAT_ID.")
         print("Veuillez créer un fichier .env et y mettre vos identifiants.")
     else:
-        bot = TelegramBot(bot_token=BOT_TOKEN, chat_id=CHAT_ID, handlers=[HelloHandler(), ByeHandler()])
+        bot = TelegramBot(bot_token=BOT_TOKEN, chat_id=CHAT_ID, handlers=[HelloHandler(), ByeHandler()]).start()
         # my_handler = HelloHandler()
         # bot.handler = my_handler
         print(f"Bot démarré pour le chat ID {CHAT_ID}. Handlers: {bot.handlers}")
@@ -32,5 +32,5 @@ if __name__ == "__main__":
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
-            bot.stop()
+            bot.stop(timeout=10)
             print("\nBot arrêté proprement.")
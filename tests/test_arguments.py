@@ -0,0 +1,70 @@
+"""Tests unitaires pour le module arguments."""
+
+import datetime
+import enum
+import unittest
+from decimal import Decimal
+from typing import Optional
+
+from venantvr.telegram.arguments import ArgumentError, ArgumentSchema, split_arguments
+
+
+class Side(enum.Enum):
+    BUY = "achat"
+    SELL = "vente"
+
+
+def order(symbol, side, quantity, price=None, expires: Optional[datetime.date] = None, note="-"):
+    return symbol, side, quantity, price, expires, note
+
+
+class TestArguments(unittest.TestCase):
+    """Tests pour le découpage et la conversion des arguments."""
+
+    def setUp(self) -> None:
+        """Initialisation avant chaque test."""
+        self.schema = ArgumentSchema.compile("/order", order, {
+            "side": Side, "quantity": Decimal, "price": Optional[float], "expires": Optional[datetime.date]
+        })
+
+    def test_split_quoted_strings(self):
+        """Test que les guillemets regroupent un argument et que les apostrophes sont ignorées."""
+        self.assertEqual(split_arguments("BTC  achat 1"), ["BTC", "achat", "1"])
+        self.assertEqual(split_arguments('BTC "prise de profit" l\'ordre'), ["BTC", "prise de profit", "l'ordre"])
+        self.assertEqual(split_arguments(r'"dit \"stop\"" ""'), ['dit "stop"', ""])
+
+    def test_converters_and_defaults(self):
+        """Test les conversions décimale, Enum, date et les valeurs par défaut."""
+        kwargs = self.schema.parse(["BTC", "SELL", "0,5", "42000.5", "31/12/2025"])
+
+        self.assertEqual(kwargs["side"], Side.SELL)
+        self.assertEqual(kwargs["quantity"], Decimal("0.5"))
+        self.assertEqual(kwargs["price"], 42000.5)
+        self.assertEqual(kwargs["expires"], datetime.date(2025, 12, 31))
+        self.assertEqual(kwargs["note"], "-")
+        self.assertIsNone(self.schema.parse(["BTC", "achat", "1"])["price"])
+
+    def test_arity_with_optional_arguments(self):
+        """Test le message d'erreur quand le nombre d'arguments sort de l'intervalle admis."""
+        with self.assertRaises(ArgumentError) as error:
+            self.schema.parse(["BTC"])
+        self.assertIn("Attendu: 3 à 6, Reçu: 1", str(error.exception))
+
+    def test_invalid_value(self):
+        """Test qu'une valeur invalide indique l'argument et le type attendu."""
+        with self.assertRaises(ArgumentError) as error:
+            self.schema.parse(["BTC", "hold", "1"])
+        self.assertIn("'side'", str(error.exception))
+        self.assertIn("buy | sell", str(error.exception))
+        with self.assertRaises(ArgumentError):
+            self.schema.validate_step(2, "beaucoup")
+        self.schema.validate_step(2, "1.5")
+
+    def test_from_details_without_compiled_schema(self):
+        """Test qu'un détail de commande sans schéma compilé reste utilisable."""
+        schema = ArgumentSchema.from_details({"arg_names": ["n"], "kwargs_types": {"n": int}})
+        self.assertEqual(schema.parse(["3"]), {"n": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
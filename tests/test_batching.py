@@ -0,0 +1,116 @@
+"""Tests unitaires pour le regroupement des appels de commande."""
+
+import time
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import Mock
+
+from venantvr.telegram.batching import CommandBatcher
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.decorators import command
+from venantvr.telegram.handler import TelegramHandler
+
+
+class PriceHandler(TelegramHandler):
+    def __init__(self) -> None:
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    @command(name="/batchprice", description="Prix", batch="prices", batch_window=60)
+    def price(self, symbol: str) -> Dict[str, str]:
+        return self.prices([{"symbol": symbol}])[0]
+
+    def prices(self, calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        self.batches.append(calls)
+        quotes = {symbol: len(symbol) * 100 for symbol in {call["symbol"] for call in calls}}
+        return [{"text": f"{call['symbol']}: {quotes[call['symbol']]}"} for call in calls]
+
+
+class SharedQuoteHandler(TelegramHandler):
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+
+    @command(name="/batchquote", description="Cours", batch="quotes", batch_window=60)
+    def quote(self, symbol: str) -> Dict[str, str]:
+        return self.quotes([{"symbol": symbol}])[0]
+
+    def quotes(self, calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        if self.fail:
+            raise RuntimeError("bourse indisponible")
+        quote = {"text": "BTC: 300"}
+        return [quote for _ in calls]
+
+
+def message(chat_id: int, text: str) -> Dict[str, Any]:
+    return {"update_id": chat_id, "message": {"text": text, "chat": {"id": chat_id}, "date": time.time()}}
+
+
+class TestCommandBatcher(unittest.TestCase):
+    """Tests pour la classe CommandBatcher."""
+
+    def test_calls_from_several_chats_served_by_one_batch(self):
+        """Test qu'un seul appel de la méthode de lot répond à chaque chat."""
+        handler = PriceHandler()
+        bot = TelegramBot("123:ABC", "1", handler)
+        for chat_id, symbol in ((1, "BTC"), (2, "ETH"), (3, "BTC")):
+            bot._process_update(message(chat_id, f"/batchprice {symbol}"))
+        self.assertTrue(bot.outgoing_queue.empty())
+
+        bot._batcher.close()
+
+        self.assertEqual(handler.batches, [[{"symbol": "BTC"}, {"symbol": "ETH"}, {"symbol": "BTC"}]])
+        payloads = [bot.outgoing_queue.get_nowait() for _ in range(3)]
+        replies = {payload["chat_id"]: payload["text"] for payload in payloads}
+        self.assertEqual(replies, {"1": "BTC: 300", "2": "ETH: 300", "3": "BTC: 300"})
+
+    def test_invalid_arguments_answered_immediately(self):
+        """Test qu'un appel aux arguments invalides n'entre pas dans le lot."""
+        handler = PriceHandler()
+        bot = TelegramBot("123:ABC", "1", handler)
+        bot._process_update(message(1, "/batchprice"))
+
+        self.assertIn("incorrect", bot.outgoing_queue.get_nowait()["text"])
+        bot._batcher.close()
+        self.assertEqual(handler.batches, [])
+
+    def test_shared_response_delivered_to_each_chat(self):
+        """Test qu'une réponse partagée par plusieurs appels, ou une erreur de lot, atteint chaque chat."""
+        for fail in (False, True):
+            with self.subTest(fail=fail):
+                bot = TelegramBot("123:ABC", "1", SharedQuoteHandler(fail))
+                for chat_id in (1, 2, 3):
+                    bot._process_update(message(chat_id, "/batchquote BTC"))
+                bot._batcher.close()
+
+                payloads = [bot.outgoing_queue.get_nowait() for _ in range(3)]
+                self.assertEqual(sorted(payload["chat_id"] for payload in payloads), ["1", "2", "3"])
+                self.assertTrue(bot.outgoing_queue.empty())
+
+    def test_max_size_and_errors(self):
+        """Test l'exécution dès `max_size` appels et la diffusion d'une erreur à chaque appel."""
+        deliver = Mock()
+        batcher = CommandBatcher(deliver, max_size=2)
+        failing = Mock(side_effect=RuntimeError("bourse indisponible"))
+        batcher.submit("k", "/price", failing, 60, {"symbol": "BTC"}, "1")
+        failing.assert_not_called()
+        batcher.submit("k", "/price", failing, 60, {"symbol": "ETH"}, "2")
+
+        failing.assert_called_once_with([{"symbol": "BTC"}, {"symbol": "ETH"}])
+        self.assertEqual([c.args[0] for c in deliver.call_args_list], ["1", "2"])
+        self.assertIn("bourse indisponible", deliver.call_args.args[1]["text"])
+        batcher.close()
+
+    def test_window_expiry(self):
+        """Test qu'un lot incomplet est exécuté à l'échéance de sa fenêtre."""
+        deliver = Mock()
+        batcher = CommandBatcher(deliver)
+        batcher.submit("k", "/price", lambda calls: [{"text": "ok"}] * len(calls), 0.01, {}, "1")
+        deadline = time.monotonic() + 2
+        while not deliver.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        deliver.assert_called_once_with("1", {"text": "ok"}, None)
+        batcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
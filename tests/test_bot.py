@@ -1,10 +1,16 @@
 """Tests unitaires pour le module TelegramBot."""
 
+import json
 import queue
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch
 
+import requests
+
 from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.config import Config
 from venantvr.telegram.handler import TelegramHandler
 
 
@@ -43,13 +49,21 @@ class TestTelegramBot(unittest.TestCase):
             bot = TelegramBot(self.bot_token, self.chat_id, [self.handler, handler2])  # type: ignore[arg-type]
             self.assertEqual(len(bot.handlers), 2)
 
-    @patch("venantvr.telegram.bot.requests.Session")
+    @patch("requests.Session")
     def test_session_creation(self, mock_session):
-        """Test la création de la session HTTP avec retry."""
+        """Test la création de la session HTTP avec retry, différée au démarrage."""
         with patch("venantvr.telegram.bot.threading.Thread"):
-            TelegramBot(self.bot_token, self.chat_id)
+            bot = TelegramBot(self.bot_token, self.chat_id)
+            mock_session.assert_not_called()
+            bot.start()
             mock_session.assert_called()
 
+    def test_init_starts_no_thread(self):
+        """Test que la construction du bot ne démarre aucun thread."""
+        with patch("venantvr.telegram.bot.threading.Thread") as mock_thread:
+            TelegramBot(self.bot_token, self.chat_id)
+            mock_thread.assert_not_called()
+
     def test_build_menu_keyboard_invalid_menu(self):
         """Test la construction d'un menu avec une valeur invalide."""
         with patch("venantvr.telegram.bot.threading.Thread"):
@@ -58,16 +72,15 @@ class TestTelegramBot(unittest.TestCase):
                 result = bot._build_menu_keyboard("invalid_menu")
                 self.assertIn("Erreur", result["text"])
 
-    @patch("venantvr.telegram.bot.COMMAND_REGISTRY")
-    def test_build_menu_keyboard_valid(self, mock_registry):
+    def test_build_menu_keyboard_valid(self):
         """Test la construction d'un menu valide."""
         mock_menu = Mock()
         mock_menu.value = "/test_menu"
-        mock_registry.values.return_value = [{"menu": mock_menu, "enum": Mock(name="TEST", value="/test")}]
 
         with patch("venantvr.telegram.bot.threading.Thread"):
             with patch("venantvr.telegram.classes.menu.Menu.from_value", return_value=mock_menu):
                 bot = TelegramBot(self.bot_token, self.chat_id)
+                bot.registry = {"/test": {"menu": mock_menu, "enum": Mock(name="TEST", value="/test")}}
                 result = bot._build_menu_keyboard("/test_menu")
 
                 self.assertIn("text", result)
@@ -103,17 +116,230 @@ class TestTelegramBot(unittest.TestCase):
                 bot.send_message("invalid_type")  # type: ignore
                 mock_logger.warning.assert_called_once()
 
+    def test_stale_message_dropped(self):
+        """Test qu'un message plus ancien que Config.MAX_UPDATE_AGE est ignoré."""
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot(self.bot_token, self.chat_id)
+            now = time.time()
+            old = {"update_id": 1, "message": {"text": "/price", "chat": {"id": 1}, "date": now - 3600}}
+            fresh = {"update_id": 2, "message": {"text": "/price", "chat": {"id": 1}, "date": now}}
+
+            self.assertTrue(bot._is_stale(old))
+            self.assertFalse(bot._is_stale(fresh))
+            self.assertEqual(bot.metrics.get("stale_dropped"), 1)
+
+    def test_stale_per_command_max_age(self):
+        """Test le seuil d'âge propre à chaque commande."""
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot(self.bot_token, self.chat_id)
+            bot.registry = {"/alert": {"max_age": 0}, "/price": {"max_age": 5}}
+            now = time.time()
+            alert = {"update_id": 1, "message": {"text": "/alert", "chat": {"id": 1}, "date": now - 3600}}
+            price = {"update_id": 2, "callback_query": {"data": "/price", "message": {"chat": {"id": 1}}},
+                     "_received_at": now - 10}
+
+            self.assertFalse(bot._is_stale(alert))
+            self.assertTrue(bot._is_stale(price))
+            self.assertGreaterEqual(bot.metrics.get("queue_age"), 10)
+
+    def test_iterator_response_paginated(self):
+        """Test qu'une réponse sous forme d'itérateur est rendue page par page."""
+        registry = {"/orders": {"action": Mock(__name__="bonjour"), "asks": []}}
+        self.handler.process_command.return_value = (f"ordre {i}" for i in range(100))
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot(self.bot_token, self.chat_id, self.handler)  # type: ignore[arg-type]
+            bot.registry = registry
+            message = {"text": "/orders", "chat": {"id": 1}, "date": time.time()}
+            bot.incoming_queue.put({"update_id": 1, "message": message})
+            bot.incoming_queue.put(None)
+            bot._processor()
+
+            payload = bot.outgoing_queue.get_nowait()
+            self.assertTrue(payload["text"].startswith("ordre 0\n"))
+            self.assertIn("inline_keyboard", payload["reply_markup"])
+            self.assertEqual(len(bot.cursors), 1)
+
+            # La page suivante remplace la première dans le même message
+            next_data = payload["reply_markup"]["inline_keyboard"][0][0]["callback_data"]
+            bot._process_update({"update_id": 2, "callback_query": {
+                "data": next_data, "message": {"chat": {"id": 1}, "message_id": 7}}})
+            page = bot.outgoing_queue.get_nowait()
+            self.assertEqual((page["_method"], page["message_id"]), ("editMessageText", 7))
+            self.assertFalse(page["text"].startswith("ordre 0\n"))
+
+    def test_prompt_answer_validated_immediately(self):
+        """Test qu'une réponse invalide à un prompt repose la question sans avancer."""
+        registry = {"/buy": {"action": Mock(__name__="bonjour"), "arg_names": ["symbol", "quantity"],
+                             "kwargs_types": {"quantity": float}, "asks": ["Symbole ?", "Quantité ?"]}}
+        self.handler.process_command.return_value = {"text": "ok"}
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot(self.bot_token, self.chat_id, self.handler)  # type: ignore[arg-type]
+            bot.registry = registry
+            bot.active_prompts["1"] = {"command": "/buy", "arguments": ["BTC"]}
+            message = {"update_id": 1, "message": {"text": "beaucoup", "chat": {"id": 1}, "date": time.time()}}
+
+            bot._process_update(message)
+            payload = bot.outgoing_queue.get_nowait()
+            self.assertIn("invalide", payload["text"])
+            self.assertTrue(payload["text"].endswith("Quantité ?"))
+            self.assertEqual(bot.active_prompts["1"]["arguments"], ["BTC"])
+
+            message["message"]["text"] = "0,5"
+            bot._process_update(message)
+            self.assertEqual(bot.outgoing_queue.get_nowait()["text"], "ok")
+            self.assertNotIn("1", bot.active_prompts)
+
+    def test_inline_arguments_keep_quoted_strings(self):
+        """Test que les arguments entre guillemets sont transmis d'un seul tenant."""
+        self.handler.process_command.return_value = {"text": "ok"}
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot(self.bot_token, self.chat_id, self.handler)  # type: ignore[arg-type]
+            bot.registry = {"/note": {"action": Mock(__name__="bonjour"), "asks": []}}
+            bot._process_update({"update_id": 1, "message": {"text": '/note BTC "prise de profit"',
+                                                             "chat": {"id": 1}, "date": time.time()}})
+
+            self.assertEqual(self.handler.process_command.call_args.args[1], ["BTC", "prise de profit"])
+
+    def test_registry_scoped_to_handlers(self):
+        """Test que chaque bot ne voit que les commandes de ses propres handlers."""
+        from tests.handlers.bye import ByeHandler
+        from tests.handlers.hello import HelloHandler
+
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            hello_bot = TelegramBot(self.bot_token, self.chat_id, HelloHandler())
+            bye_bot = TelegramBot("other_token", self.chat_id, ByeHandler())
+
+            self.assertIn("/bonjour", hello_bot.registry)
+            self.assertNotIn("/bye", hello_bot.registry)
+            self.assertIn("/bye", bye_bot.registry)
+            self.assertNotIn("/bonjour", bye_bot.registry)
+            self.assertIs(hello_bot.registry["/menu"]["action"], HelloHandler.menu)
+
     def test_stop_bot(self):
         """Test l'arrêt propre du bot."""
         with patch("venantvr.telegram.bot.threading.Thread"):
             bot = TelegramBot(self.bot_token, self.chat_id)
-            bot._session = Mock()
+            session = bot._session = Mock()
             bot.stop()
 
             # Vérifier que les signaux d'arrêt sont envoyés
             self.assertEqual(bot.outgoing_queue.get(), None)
             self.assertEqual(bot.incoming_queue.get(), None)
-            bot._session.close.assert_called_once()
+            session.close.assert_called_once()
+            self.assertIsNone(bot._session)
+
+    def test_stop_drains_outgoing_queue(self):
+        """Test que les messages en attente sont envoyés avant l'arrêt et que le long poll est interrompu."""
+        released = threading.Event()
+
+        def fake_get(url, params=None, timeout=None):
+            # Simule Telegram : un getUpdates immédiat termine le long poll en cours
+            if params["timeout"] == 0:
+                released.set()
+            else:
+                released.wait(30)
+            return Mock(json=Mock(return_value={"ok": True, "result": []}))
+
+        with patch.object(TelegramBot, "_create_session") as mock_create:
+            session = mock_create.return_value
+            session.get.side_effect = fake_get
+            bot = TelegramBot(self.bot_token, self.chat_id).start()
+            bot.send_message([{"chat_id": self.chat_id, "text": str(i)} for i in range(5)])
+
+            started = time.monotonic()
+            bot.stop(timeout=5)
+
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertEqual(session.post.call_count, 5)
+            self.assertFalse(any(thread.is_alive() for thread in bot._threads))
+            session.close.assert_called_once()
+
+    def test_restart_after_stop(self):
+        """Test qu'un bot arrêté peut être redémarré avec de nouveaux threads et une nouvelle session."""
+        def fake_get(url, params=None, timeout=None):
+            time.sleep(0.01)
+            return Mock(json=Mock(return_value={"ok": True, "result": []}))
+
+        with patch.object(TelegramBot, "_create_session") as mock_create:
+            mock_create.return_value.get.side_effect = fake_get
+            bot = TelegramBot(self.bot_token, self.chat_id).start()
+            bot.stop(timeout=5)
+            self.assertEqual(bot._threads, [])
+
+            bot.start()
+            self.assertEqual(len(bot._threads), 3)
+            self.assertTrue(all(thread.is_alive() for thread in bot._threads))
+            bot.send_message({"chat_id": self.chat_id, "text": "relancé"})
+            bot.stop(timeout=5)
+
+            self.assertEqual(mock_create.call_count, 2)
+            mock_create.return_value.post.assert_called_once()
+
+
+class TestLongPolling(unittest.TestCase):
+    """Tests pour le long polling adaptatif."""
+
+    def setUp(self) -> None:
+        """Initialisation avant chaque test."""
+        self.bot = TelegramBot("test_token_12345", "123456789")
+
+    def test_allowed_updates_derived_from_registry(self):
+        """Test que seuls les types traités sont demandés."""
+        self.assertEqual(json.loads(self.bot._poll_params(0)["allowed_updates"]), ["message"])
+        self.bot.registry = {"/price": {"menu": None}}
+        self.assertEqual(self.bot._allowed_updates(), ["message", "callback_query"])
+
+    def test_limit_follows_backlog(self):
+        """Test que le lot demandé diminue quand la file de traitement se remplit."""
+        self.assertEqual(self.bot._poll_params(0)["limit"], Config.POLL_MAX_LIMIT)
+        self.assertEqual(self.bot._poll_params(5000)["limit"], Config.POLL_MIN_LIMIT)
+
+    def test_limit_scaled_against_pause_backlog(self):
+        """Test qu'une file à mi-chemin du seuil de pause réduit le lot de moitié, sans tomber à 1."""
+        with patch.object(Config, "POLL_PAUSE_BACKLOG", 1000), patch.object(Config, "POLL_MAX_LIMIT", 100), \
+                patch.object(Config, "POLL_MIN_LIMIT", 10):
+            self.assertEqual(self.bot._poll_params(500)["limit"], 50)
+            self.assertEqual(self.bot._poll_params(99)["limit"], 90)
+            self.assertEqual(self.bot._poll_params(990)["limit"], 10)
+
+    def test_backoff_grows_with_jitter_and_honours_retry_after(self):
+        """Test l'attente exponentielle bornée et le respect de retry_after."""
+        error = requests.ConnectionError("coupure")
+        delays = [self.bot._poll_backoff(streak, error) for streak in (1, 2, 3, 20)]
+        for delay, ceiling in zip(delays, (0.5, 1.0, 2.0, Config.POLL_BACKOFF_MAX)):
+            self.assertTrue(ceiling / 2 <= delay <= ceiling)
+        self.assertEqual(self.bot.metrics.get("poll_error_streak"), 20)
+
+        throttled = requests.HTTPError(response=Mock(status_code=429, json=Mock(
+            return_value={"parameters": {"retry_after": 7}})))
+        self.assertEqual(self.bot._poll_backoff(1, throttled), 7)
+
+    def test_receiver_resets_error_streak_and_records_metrics(self):
+        """Test qu'un succès remet à zéro la série d'erreurs et alimente les métriques."""
+        bot = self.bot
+        update = {"update_id": 7, "message": {"text": "/price", "chat": {"id": 1}, "date": time.time()}}
+        responses = [requests.ConnectionError("coupure"),
+                     Mock(json=Mock(return_value={"ok": True, "result": [update]})),
+                     Mock(json=Mock(return_value={"ok": True, "result": []}))]
+
+        def fake_get(url, params=None, timeout=None):
+            response = responses.pop(0)
+            if not responses:
+                bot._stop_event.set()
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        bot._session = Mock(get=Mock(side_effect=fake_get))
+        with patch.object(Config, "POLL_BACKOFF_BASE", 0.01):
+            bot._receiver()
+
+        self.assertEqual(bot.metrics.get("poll_errors"), 1)
+        self.assertEqual(bot.metrics.get("polls"), 1)
+        self.assertEqual(bot.metrics.get("poll_error_streak"), 0)
+        self.assertEqual(bot.metrics.get("poll_batch_size"), 1)
+        self.assertEqual(bot.incoming_queue.get_nowait()["update_id"], 7)
+        self.assertEqual(bot._session.get.call_args.kwargs["params"]["offset"], 8)
 
 
 if __name__ == "__main__":
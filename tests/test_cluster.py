@@ -0,0 +1,61 @@
+"""Tests unitaires pour le module ProcessCluster."""
+
+import time
+import unittest
+from unittest.mock import Mock
+
+from tests.handlers.hello import HelloHandler
+from venantvr.telegram.cluster import ProcessCluster
+
+
+def make_message(update_id: int, chat_id: int, text: str) -> dict:
+    return {"update_id": update_id, "message": {"text": text, "chat": {"id": chat_id}, "date": time.time()}}
+
+
+class TestProcessCluster(unittest.TestCase):
+    """Tests pour la classe ProcessCluster."""
+
+    def test_sharding_by_chat_id(self):
+        """Test qu'un chat est toujours attribué au même processus."""
+        cluster = ProcessCluster("123:ABC", "1", [HelloHandler], workers=3)
+
+        self.assertIs(cluster._shard_for(make_message(1, 4, "/hello")), cluster._updates[1])
+        callback = {"update_id": 2, "callback_query": {"data": "/hello", "message": {"chat": {"id": 4}}}}
+        self.assertIs(cluster._shard_for(callback), cluster._updates[1])
+        self.assertIs(cluster._shard_for(make_message(3, -5, "/hello")), cluster._updates[-5 % 3])
+        self.assertIn("/bonjour", cluster.bot.registry)
+
+    def test_conversations_processed_in_workers(self):
+        """Test un échange complet, prompts compris, à travers les processus de traitement."""
+        cluster = ProcessCluster("123:ABC", "1", [HelloHandler], workers=2)
+        cluster.session = Mock()
+        cluster.start(poll=False)
+        for chat_id in (10, 11):
+            cluster.feed_update(make_message(1, chat_id, "/bonjour"))
+            cluster.feed_update(make_message(2, chat_id, "Alice"))
+            cluster.feed_update(make_message(3, chat_id, "30"))
+        cluster.stop(timeout=30)
+
+        payloads = [c.kwargs["json"] for c in cluster.session.post.call_args_list]
+        self.assertEqual(len(payloads), 6)
+        for chat_id in ("10", "11"):
+            texts = [p["text"] for p in payloads if p["chat_id"] == chat_id]
+            self.assertEqual(texts, ["Quel est votre nom ?", "Quel est votre âge ?",
+                                     "Bonjour, Alice ! À 30 ans, vous êtes un adulte."])
+
+    def test_admin_commands_forwarded_to_workers(self):
+        """Test que `/profile` est servi par les processus de traitement aux seuls chats administrateurs."""
+        cluster = ProcessCluster("123:ABC", "1", [HelloHandler], workers=2, admin_chat_ids=["10"])
+        cluster.session = Mock()
+        cluster.start(poll=False)
+        for chat_id in (10, 11):
+            cluster.feed_update(make_message(1, chat_id, "/profile status"))
+        cluster.stop(timeout=30)
+
+        replies = {c.kwargs["json"]["chat_id"]: c.kwargs["json"]["text"] for c in cluster.session.post.call_args_list}
+        self.assertNotIn("non reconnue", replies["10"])
+        self.assertIn("non reconnue", replies["11"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Tests unitaires pour le module UpdateDebouncer."""
+
+import unittest
+from unittest.mock import patch
+
+from venantvr.telegram.debounce import UpdateDebouncer
+
+
+def make_callback(update_id: int, data: str, chat_id: int = 42, message_id: int = 7) -> dict:
+    return {
+        "update_id": update_id,
+        "callback_query": {"data": data, "message": {"message_id": message_id, "chat": {"id": chat_id}}},
+    }
+
+
+class TestUpdateDebouncer(unittest.TestCase):
+    """Tests pour la classe UpdateDebouncer."""
+
+    def test_duplicates_collapsed_within_batch(self):
+        """Test qu'un double appui dans le même lot n'est traité qu'une fois."""
+        debouncer = UpdateDebouncer({}, default_window=1.0)
+        batch = [make_callback(1, "/buy"), make_callback(2, "/buy"), make_callback(3, "/sell")]
+
+        kept = debouncer.filter(batch)
+
+        self.assertEqual([u["update_id"] for u in kept], [1, 3])
+
+    def test_distinct_chats_and_messages_kept(self):
+        """Test que les callbacks de chats ou messages différents sont conservés."""
+        debouncer = UpdateDebouncer({}, default_window=1.0)
+        batch = [make_callback(1, "/buy", chat_id=1), make_callback(2, "/buy", chat_id=2),
+                 make_callback(3, "/buy", chat_id=1, message_id=8)]
+
+        self.assertEqual(len(debouncer.filter(batch)), 3)
+
+    def test_text_messages_untouched(self):
+        """Test que les messages texte ne sont jamais filtrés."""
+        debouncer = UpdateDebouncer({}, default_window=1.0)
+        message = {"update_id": 1, "message": {"text": "/price", "chat": {"id": 1}}}
+
+        self.assertEqual(len(debouncer.filter([message, dict(message, update_id=2)])), 2)
+
+    def test_window_expires_across_batches(self):
+        """Test qu'un callback est accepté à nouveau une fois la fenêtre écoulée."""
+        debouncer = UpdateDebouncer({}, default_window=1.0)
+        with patch("venantvr.telegram.debounce.time.monotonic", side_effect=[100.0, 100.5, 102.0]):
+            self.assertEqual(len(debouncer.filter([make_callback(1, "/buy")])), 1)
+            self.assertEqual(len(debouncer.filter([make_callback(2, "/buy")])), 0)
+            self.assertEqual(len(debouncer.filter([make_callback(3, "/buy")])), 1)
+
+    def test_infinite_window_not_evicted(self):
+        """Test qu'un bouton à fenêtre infinie reste ignoré au-delà de `max_entries` clés."""
+        registry = {"/sell": {"debounce": float("inf")}}
+        debouncer = UpdateDebouncer(registry, default_window=1.0, max_entries=2)
+        self.assertEqual(len(debouncer.filter([make_callback(1, "/sell")])), 1)
+        debouncer.filter([make_callback(i, "/other", message_id=i) for i in range(2, 10)])
+
+        self.assertEqual(debouncer.filter([make_callback(10, "/sell")]), [])
+
+    def test_per_command_window(self):
+        """Test la configuration de la fenêtre par commande."""
+        registry = {"/refresh": {"debounce": 0}, "/order": {"debounce": float("inf")}}
+        debouncer = UpdateDebouncer(registry, default_window=1.0)
+
+        kept = debouncer.filter([make_callback(1, "/refresh"), make_callback(2, "/refresh")])
+        self.assertEqual(len(kept), 2)
+
+        with patch("venantvr.telegram.debounce.time.monotonic", side_effect=[0.0, 3600.0]):
+            self.assertEqual(len(debouncer.filter([make_callback(3, "/order")])), 1)
+            self.assertEqual(len(debouncer.filter([make_callback(4, "/order")])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@
 import unittest
 from unittest.mock import Mock, patch
 
+from venantvr.telegram.bot import TelegramBot
 from venantvr.telegram.classes.command import Command
+from venantvr.telegram.decorators import command
 from venantvr.telegram.handler import TelegramHandler
 
 
@@ -110,6 +112,32 @@ class TestTelegramHandler(unittest.TestCase):
         self.assertIn("Erreur", result["text"])
         mock_logger.error.assert_called()
 
+    def test_help_lists_bot_menus(self):
+        """Test que /help liste les menus de tous les handlers du bot, et seulement ceux-là."""
+
+        class DeskAHandler(TelegramHandler):
+            @command(name="/deskA", description="Desk A", menu="/deskAmenu")
+            def desk_a(self) -> dict:
+                return {"text": "A"}
+
+        class DeskBHandler(TelegramHandler):
+            @command(name="/deskB", description="Desk B", menu="/deskBmenu")
+            def desk_b(self) -> dict:
+                return {"text": "B"}
+
+        class DeskCHandler(TelegramHandler):
+            @command(name="/deskC", description="Desk C", menu="/deskCmenu")
+            def desk_c(self) -> dict:
+                return {"text": "C"}
+
+        bot = TelegramBot("123:ABC", "1", [DeskAHandler(), DeskBHandler()])
+        bot._process_update({"update_id": 1, "message": {"text": "/help", "chat": {"id": 1}}})
+        text = bot.outgoing_queue.get_nowait()["text"]
+
+        self.assertIn("/deskAmenu", text)
+        self.assertIn("/deskBmenu", text)
+        self.assertNotIn("/deskCmenu", text)
+
 
 class TestHandlerIntegration(unittest.TestCase):
     """Tests d'intégration pour le handler."""
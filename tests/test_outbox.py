@@ -0,0 +1,164 @@
+"""Tests unitaires pour le module SqliteOutbox."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from decimal import Decimal
+from typing import Dict
+from unittest.mock import Mock
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.decorators import command
+from venantvr.telegram.handler import TelegramHandler
+from venantvr.telegram.outbox import SqliteOutbox
+
+
+class QuantityHandler(TelegramHandler):
+    @command(name="/outboxqty", description="Quantité", kwargs_types={"qty": Decimal})
+    def qty(self, qty: Decimal) -> Dict[str, object]:
+        # Réponse non sérialisable en JSON
+        return {"text": "ok", "qty": qty}
+
+    @command(name="/outboxping", description="Ping")
+    def ping(self) -> Dict[str, str]:
+        return {"text": "pong"}
+
+
+class TestSqliteOutbox(unittest.TestCase):
+    """Tests pour la classe SqliteOutbox."""
+
+    def setUp(self) -> None:
+        """Initialisation avant chaque test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "outbox.db")
+
+    def tearDown(self) -> None:
+        """Nettoyage après chaque test."""
+        self.directory.cleanup()
+
+    def test_pending_messages_survive_restart(self):
+        """Test qu'un message non acquitté est renvoyé après réouverture."""
+        outbox = SqliteOutbox(self.path)
+        outbox.put({"chat_id": "1", "text": "a"})
+        outbox.put({"chat_id": "1", "text": "b"})
+        row_id, payload = outbox.get(timeout=0)
+        self.assertEqual(payload["text"], "a")
+        outbox.ack(row_id)
+        outbox.close()
+
+        outbox = SqliteOutbox(self.path)
+        self.assertEqual(outbox.pending_count(), 1)
+        self.assertEqual(outbox.get(timeout=0)[1]["text"], "b")
+        self.assertIsNone(outbox.get(timeout=0))
+        outbox.close()
+
+    def test_group_commit_on_batch_size(self):
+        """Test que les messages sont écrits par lots de `batch_size`."""
+        outbox = SqliteOutbox(self.path, batch_size=3, commit_interval=60)
+        for i in range(2):
+            outbox.put({"text": str(i)})
+        self.assertEqual(outbox._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 0)
+        outbox.put({"text": "2"})
+        self.assertEqual(outbox._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 3)
+        outbox.close()
+
+    def test_new_message_written_while_claimed_messages_wait(self):
+        """Test qu'un message mis en file atteint le disque même si des messages chargés attendent leur envoi."""
+        outbox = SqliteOutbox(self.path, commit_interval=60)
+        for text in ("a", "b"):
+            outbox.put({"text": text})
+        outbox.get(timeout=0)
+        self.assertTrue(outbox._ready)
+        outbox.put({"text": "alerte"})
+
+        outbox.get(timeout=0)
+
+        # Vu depuis une autre connexion, comme après un crash
+        with sqlite3.connect(self.path) as conn:
+            stored = [row[0] for row in conn.execute("SELECT payload FROM outbox ORDER BY id")]
+        self.assertEqual(len(stored), 3)
+        self.assertIn("alerte", stored[-1])
+        outbox.close()
+
+    def test_group_commit_on_commit_interval(self):
+        """Test qu'un message est écrit dès que son attente atteint `commit_interval`."""
+        outbox = SqliteOutbox(self.path, batch_size=100, commit_interval=0)
+        outbox.put({"text": "a"})
+        self.assertEqual(outbox._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 1)
+        outbox.close()
+
+    def test_bounded_retries_then_dead_letter(self):
+        """Test qu'un message est retenté puis abandonné après `max_attempts` échecs."""
+        outbox = SqliteOutbox(self.path, max_attempts=2, retry_backoff=0)
+        outbox.put({"text": "a"})
+        row_id, _ = outbox.get(timeout=0)
+        self.assertTrue(outbox.fail(row_id, "HTTP 502"))
+        row_id, _ = outbox.get(timeout=0)
+        self.assertFalse(outbox.fail(row_id, "HTTP 502"))
+
+        self.assertEqual(outbox.pending_count(), 0)
+        dead = outbox.dead_letters()
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(dead[0]["payload"], {"text": "a"})
+        self.assertEqual(dead[0]["attempts"], 2)
+        outbox.close()
+
+    def test_retry_is_delayed(self):
+        """Test qu'un message en échec n'est pas renvoyé avant son délai."""
+        outbox = SqliteOutbox(self.path, retry_backoff=60)
+        outbox.put({"text": "a"})
+        row_id, _ = outbox.get(timeout=0)
+        outbox.fail(row_id, "erreur réseau")
+        self.assertIsNone(outbox.get(timeout=0))
+        self.assertEqual(outbox.pending_count(), 1)
+        outbox.close()
+
+    def test_bot_acks_on_2xx_and_dead_letters_permanent_errors(self):
+        """Test l'envoi par le bot : 2xx acquitté, 400 en dead letter, 502 retenté."""
+        outbox = SqliteOutbox(self.path, retry_backoff=60)
+        bot = TelegramBot("123:ABC", "1", outbox=outbox)
+        bot._session = Mock()
+        bot._session.post.side_effect = [Mock(status_code=200), Mock(status_code=400, text="Bad Request"),
+                                         Mock(status_code=502, text="Bad Gateway")]
+        bot.send_message([{"chat_id": "1", "text": str(i)} for i in range(3)])
+        bot._drain_event.set()
+
+        bot._outbox_sender()
+
+        self.assertEqual(bot._session.post.call_count, 3)
+        self.assertEqual(bot.metrics.get("messages_sent"), 1)
+        self.assertEqual(bot.metrics.get("dead_letters"), 1)
+        self.assertEqual(bot.metrics.get("outbox_retries"), 1)
+        self.assertEqual([d["payload"]["text"] for d in outbox.dead_letters()], ["1"])
+        self.assertEqual(outbox.pending_count(), 1)
+        outbox.close()
+
+    def test_unserializable_response_does_not_stop_processor(self):
+        """Test qu'une réponse non sérialisable part en dead letter sans arrêter le traitement."""
+        outbox = SqliteOutbox(self.path)
+        bot = TelegramBot("123:ABC", "1", QuantityHandler(), outbox=outbox)
+        for update_id, text in enumerate(("/outboxqty 1,5", "/outboxping")):
+            bot.incoming_queue.put({"update_id": update_id, "message": {"text": text, "chat": {"id": 1}}})
+        bot.incoming_queue.put(None)
+
+        bot._processor()
+
+        self.assertEqual(bot.metrics.get("updates_processed"), 2)
+        self.assertEqual(bot.metrics.get("dead_letters"), 1)
+        dead_letter, = outbox.dead_letters()
+        self.assertIn("sérialisable", dead_letter["error"])
+        self.assertEqual(dead_letter["payload"]["qty"], "Decimal('1.5')")
+        self.assertEqual(outbox.get(timeout=0)[1]["text"], "pong")
+        outbox.close()
+
+    def test_outbox_rejected_with_runtime(self):
+        """Test qu'une outbox ne peut pas être combinée à un runtime partagé."""
+        outbox = SqliteOutbox(self.path)
+        with self.assertRaises(ValueError):
+            TelegramBot("123:ABC", "1", runtime=Mock(), outbox=outbox)
+        outbox.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
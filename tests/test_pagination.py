@@ -0,0 +1,96 @@
+"""Tests unitaires pour le module pagination."""
+
+import unittest
+from unittest.mock import patch
+
+from venantvr.telegram.pagination import PAGE_CALLBACK_PREFIX, CursorStore, PageCursor
+
+
+class TestPageCursor(unittest.TestCase):
+    """Tests pour la classe PageCursor."""
+
+    def test_pages_produced_lazily(self):
+        """Test que seules les lignes nécessaires sont lues dans l'itérateur."""
+        consumed = []
+
+        def rows():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"ligne {i}"
+
+        cursor = PageCursor(rows(), page_size=10)
+
+        self.assertEqual(consumed, [])
+        self.assertEqual(cursor.page(0).splitlines()[0], "ligne 0")
+        self.assertTrue(cursor.has_page(1))
+        self.assertEqual(len(consumed), 11)
+
+    def test_page_respects_max_length(self):
+        """Test qu'une page ne dépasse jamais la longueur maximale."""
+        cursor = PageCursor(("x" * 30 for _ in range(10)), header="Titre", page_size=100, max_length=100)
+
+        text = cursor.page(0)
+
+        self.assertLessEqual(len(text), 100)
+        self.assertTrue(text.startswith("Titre\n"))
+        self.assertTrue(cursor.has_page(1))
+
+    def test_out_of_range(self):
+        """Test les pages inexistantes."""
+        cursor = PageCursor(iter(["a", "b"]), page_size=2)
+
+        self.assertIsNone(cursor.page(1))
+        self.assertFalse(cursor.has_page(1))
+        self.assertIsNone(cursor.page(-1))
+
+
+class TestCursorStore(unittest.TestCase):
+    """Tests pour la classe CursorStore."""
+
+    def test_render_navigation(self):
+        """Test les boutons précédent/suivant."""
+        store = CursorStore()
+        cursor_id = store.add(PageCursor((str(i) for i in range(25)), page_size=10))
+
+        first = store.render(cursor_id, 0)
+        buttons = first["reply_markup"]["inline_keyboard"][0]
+        self.assertEqual([b["callback_data"] for b in buttons], [f"{PAGE_CALLBACK_PREFIX}{cursor_id}:1"])
+
+        last = store.render_callback(f"{PAGE_CALLBACK_PREFIX}{cursor_id}:2")
+        self.assertEqual(last["text"], "20\n21\n22\n23\n24")
+        self.assertEqual(len(last["reply_markup"]["inline_keyboard"][0]), 1)
+
+    def test_cursor_reserved_to_its_chat(self):
+        """Test qu'un curseur n'est servi qu'à son chat, sous un identifiant non prévisible."""
+        store = CursorStore()
+        cursor_id = store.add(PageCursor((str(i) for i in range(25)), page_size=10), chat_id="1")
+        other_id = store.add(PageCursor(iter(["b"])), chat_id="1")
+
+        self.assertNotEqual(cursor_id, other_id)
+        self.assertGreaterEqual(len(cursor_id), 10)
+        self.assertLessEqual(len(f"{PAGE_CALLBACK_PREFIX}{cursor_id}:999"), 64)
+        self.assertIn("expiré", store.render_callback(f"{PAGE_CALLBACK_PREFIX}{cursor_id}:1", "2")["text"])
+        page = store.render_callback(f"{PAGE_CALLBACK_PREFIX}{cursor_id}:1", "1")
+        self.assertEqual(page["text"].splitlines()[0], "10")
+
+    def test_bounded_store(self):
+        """Test l'éviction des curseurs les plus anciens."""
+        store = CursorStore(max_entries=2)
+        first = store.add(PageCursor(iter(["a"])))
+        store.add(PageCursor(iter(["b"])))
+        store.add(PageCursor(iter(["c"])))
+
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(first))
+        self.assertIn("expiré", store.render(first, 0)["text"])
+
+    def test_expired_cursor(self):
+        """Test l'expiration des curseurs inutilisés."""
+        store = CursorStore(ttl=60)
+        with patch("venantvr.telegram.pagination.time.monotonic", side_effect=[0.0, 0.0, 61.0]):
+            cursor_id = store.add(PageCursor(iter(["a"])))
+            self.assertIsNone(store.get(cursor_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests unitaires pour le module HandlerProfiler."""
+
+import pstats
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.handler import TelegramHandler
+from venantvr.telegram.profiling import HandlerProfiler
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def spin(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        busy(2000)
+
+
+class TestHandlerProfiler(unittest.TestCase):
+    """Tests pour la classe HandlerProfiler."""
+
+    def test_command_filter_and_sampling(self):
+        """Test la sélection des commandes et la fraction d'appels profilés."""
+        profiler = HandlerProfiler()
+        profiler.enable(commands=["/slow"], sample_rate=1.0)
+
+        self.assertTrue(profiler.should_profile("/slow"))
+        self.assertFalse(profiler.should_profile("/fast"))
+        profiler.enable(sample_rate=0.0)
+        self.assertFalse(profiler.should_profile("/slow"))
+
+    def test_cprofile_aggregation_and_dump(self):
+        """Test l'agrégation cProfile et l'export pstats."""
+        profiler = HandlerProfiler()
+        profiler.enable()
+        for _ in range(3):
+            self.assertEqual(profiler.run("/slow", busy, 1000), busy(1000))
+
+        self.assertEqual(profiler.calls, 3)
+        self.assertIn("busy", profiler.summary())
+        with tempfile.TemporaryDirectory() as directory:
+            path = profiler.dump(directory)
+            self.assertTrue(path.endswith(".pstats"))
+            self.assertTrue(any("busy" in func[2] for func in pstats.Stats(path).stats))
+
+    def test_sampler_collapsed_stacks(self):
+        """Test l'échantillonnage des piles au format replié."""
+        profiler = HandlerProfiler(interval=0.001)
+        profiler.enable(mode="sample")
+        profiler.run("/slow", spin, 0.2)
+        profiler.disable()
+
+        lines = profiler.collapsed()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith("/slow;") for line in lines))
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertTrue(profiler.dump(directory).endswith(".folded"))
+
+    def test_admin_command(self):
+        """Test la commande d'administration /profile."""
+        profiler = HandlerProfiler()
+
+        self.assertIn("activé", profiler.command(["on", "0.5", "/price"]))
+        self.assertEqual(profiler.commands, frozenset({"/price"}))
+        self.assertEqual(profiler.sample_rate, 0.5)
+        self.assertIn("désactivé", profiler.command(["off"]))
+        self.assertFalse(profiler.enabled)
+        self.assertIn("invalide", profiler.command(["on", "beaucoup"]))
+
+
+class TestBotProfiling(unittest.TestCase):
+    """Tests de l'intégration du profileur dans le bot."""
+
+    def setUp(self) -> None:
+        self.handler = Mock(spec=TelegramHandler)
+        self.handler.process_command.return_value = {"text": "ok"}
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            self.bot = TelegramBot("123:ABC", "1", self.handler, admin_chat_ids=["1"])  # type: ignore[arg-type]
+        self.bot.registry = {"/price": {"action": Mock(__name__="bonjour"), "asks": []}}
+
+    def send(self, chat_id: int, text: str) -> dict:
+        message = {"text": text, "chat": {"id": chat_id}, "date": time.time()}
+        self.bot._process_update({"update_id": 1, "message": message})
+        return self.bot.outgoing_queue.get_nowait()
+
+    def test_profile_command_admin_only(self):
+        """Test que seuls les chats administrateurs peuvent piloter le profileur."""
+        self.assertIn("non reconnue", self.send(2, "/profile on")["text"])
+        self.assertFalse(self.bot.profiler.enabled)
+
+        self.send(1, "/profile on /price")
+        self.assertTrue(self.bot.profiler.enabled)
+
+    def test_handler_profiled_only_when_enabled(self):
+        """Test que process_command n'est enveloppé que lorsque le profilage est actif."""
+        with patch.object(self.bot.profiler, "run") as mock_run:
+            self.send(1, "/price")
+            mock_run.assert_not_called()
+
+            self.bot.profiler.enable(commands=["/price"])
+            mock_run.return_value = {"text": "ok"}
+            self.send(1, "/price")
+            mock_run.assert_called_once()
+        self.bot.profiler.disable()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Tests unitaires pour le module RateLimiter."""
+
+import unittest
+from unittest.mock import patch
+
+from venantvr.telegram.ratelimit import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests pour la classe RateLimiter."""
+
+    def test_burst_then_delay(self):
+        """Test qu'au-delà de la rafale, chaque envoi est retardé selon le débit."""
+        with patch("venantvr.telegram.ratelimit.time.monotonic", return_value=0.0):
+            limiter = RateLimiter(rate=10, burst=2)
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertAlmostEqual(limiter.reserve(), 0.1)
+            self.assertAlmostEqual(limiter.reserve(), 0.2)
+
+    def test_refill(self):
+        """Test que le seau se remplit avec le temps."""
+        with patch("venantvr.telegram.ratelimit.time.monotonic", side_effect=[0.0, 0.0, 1.0]):
+            limiter = RateLimiter(rate=1, burst=1)
+            self.assertEqual(limiter.reserve(), 0.0)
+            self.assertEqual(limiter.reserve(), 0.0)
+
+    def test_unlimited(self):
+        """Test qu'un débit nul désactive la limitation."""
+        limiter = RateLimiter(rate=0, burst=1)
+        self.assertEqual([limiter.reserve() for _ in range(100)], [0.0] * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests unitaires pour les entrées du registre et les enums dynamiques."""
+
+import unittest
+
+from venantvr.telegram.classes.command import Command
+from venantvr.telegram.classes.menu import Menu
+from venantvr.telegram.classes.types import PromptState
+from venantvr.telegram.decorators import COMMAND_REGISTRY, CommandSpec, command
+
+
+class TestDynamicEnum(unittest.TestCase):
+    """Tests pour DynamicEnum."""
+
+    def test_lookup_does_not_create_members(self):
+        """Test qu'une valeur inconnue n'est pas matérialisée par `from_value`."""
+        before = len(Command.get_all())
+        for i in range(100):
+            self.assertIsNone(Command.from_value(f"/inconnue{i}"))
+        self.assertEqual(len(Command.get_all()), before)
+
+    def test_subclasses_have_own_tables(self):
+        """Test que Command et Menu ne partagent pas leurs membres."""
+        member = Command.define("/registry_only")
+        self.assertIs(Command.from_value("/registry_only"), member)
+        self.assertIs(Command.define("/registry_only"), member)
+        self.assertIsNone(Menu.from_value("/registry_only"))
+        self.assertIsNot(Command._value_map, Menu._value_map)
+
+    def test_member_is_slotted(self):
+        """Test que les membres n'ont pas de dictionnaire d'attributs."""
+        self.assertFalse(hasattr(Command.define("/slotted"), "__dict__"))
+
+
+class TestCommandSpec(unittest.TestCase):
+    """Tests pour CommandSpec."""
+
+    def test_spec_is_frozen_and_mapping_compatible(self):
+        """Test l'accès par clé et l'immuabilité d'une entrée du registre."""
+
+        @command(name="/spec_test", description="Test", asks=["Symbole ?"], menu="/menu")
+        def spec_test(symbol):
+            return {"text": symbol}
+
+        spec = COMMAND_REGISTRY["/spec_test"]
+        self.assertIsInstance(spec, CommandSpec)
+        self.assertEqual(spec["asks"], ("Symbole ?",))
+        self.assertEqual(spec.get("arg_names"), ("symbol",))
+        self.assertIsNone(spec.get("inexistant"))
+        self.assertIs(spec["enum"], Command.from_value("/spec_test"))
+        self.assertIs(spec.menu, Menu.from_value("/menu"))
+        with self.assertRaises(AttributeError):
+            spec.asks = ()
+        with self.assertRaises(KeyError):
+            _ = spec["inexistant"]
+
+    def test_prompt_state(self):
+        """Test l'accès par clé à l'état d'un prompt."""
+        state = PromptState("/spec_test")
+        state["arguments"].append("BTC")
+        self.assertEqual(state.arguments, ["BTC"])
+        self.assertFalse(hasattr(state, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests unitaires pour le module BotRuntime."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from tests.handlers.bye import ByeHandler
+from tests.handlers.hello import HelloHandler
+from venantvr.telegram.ratelimit import RateLimiter
+from venantvr.telegram.runtime import BotRuntime
+
+
+class TestBotRuntime(unittest.TestCase):
+    """Tests pour la classe BotRuntime."""
+
+    def setUp(self) -> None:
+        """Initialisation avant chaque test, sans démarrer de threads."""
+        patcher = patch("threading.Thread")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.runtime = BotRuntime(processor_workers=4, sender_workers=2).start()
+        self.hello_bot = self.runtime.add_bot("111:AAA", "1", HelloHandler())
+        self.bye_bot = self.runtime.add_bot("222:BBB", "2", ByeHandler())
+
+    def test_shared_session_and_scoped_registries(self):
+        """Test que la session est partagée mais pas les commandes."""
+        self.assertIs(self.hello_bot._session, self.runtime.session)
+        self.assertIs(self.bye_bot._session, self.runtime.session)
+        self.assertNotIn("/bye", self.hello_bot.registry)
+        self.assertNotIn("/bonjour", self.bye_bot.registry)
+
+    def test_duplicate_bot_rejected(self):
+        """Test qu'un même token ne peut être hébergé deux fois."""
+        with self.assertRaises(ValueError):
+            self.runtime.add_bot("111:CCC", "1")
+
+    def test_updates_sharded_by_bot_and_chat(self):
+        """Test que les mises à jour d'un même chat vont toujours dans la même file."""
+        update = {"update_id": 1, "message": {"text": "/hello", "chat": {"id": 42}}}
+        callback = {"update_id": 2, "callback_query": {"data": "/hello", "message": {"chat": {"id": 42}}}}
+
+        self.hello_bot._enqueue_update(update)
+        self.hello_bot._enqueue_update(callback)
+
+        shards = [q for q in self.runtime._incoming if not q.empty()]
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(shards[0].qsize(), 2)
+        self.assertTrue(self.hello_bot.incoming_queue.empty())
+
+    def test_backlog_counted_per_bot(self):
+        """Test que la file d'un bot chargé ne réduit pas la réception des autres bots."""
+        for update_id in range(3):
+            self.hello_bot._enqueue_update({"update_id": update_id, "message": {"text": "/hello", "chat": {"id": 42}}})
+
+        self.assertEqual(self.hello_bot._incoming_backlog(), 3)
+        self.assertEqual(self.bye_bot._incoming_backlog(), 0)
+
+        shard, = [q for q in self.runtime._incoming if not q.empty()]
+        shard.put(None)
+        self.runtime._processor(shard)
+        self.assertEqual(self.hello_bot._incoming_backlog(), 0)
+
+    def test_payloads_sent_through_shared_sender_with_per_bot_metrics(self):
+        """Test l'envoi partagé et la séparation des métriques."""
+        self.runtime.session.post = Mock(return_value=Mock(status_code=200))
+        self.hello_bot.send_message({"chat_id": "1", "text": "a"})
+        self.bye_bot.send_message({"chat_id": "2", "text": "b"})
+        self.runtime._outgoing.put(None)
+
+        self.runtime._sender()
+
+        self.assertEqual(self.runtime.session.post.call_count, 2)
+        metrics = self.runtime.metrics()
+        self.assertEqual(metrics["111"]["messages_sent"], 1)
+        self.assertEqual(metrics["222"]["messages_sent"], 1)
+
+    def test_throttled_bot_does_not_block_shared_sender(self):
+        """Test qu'un bot à court de jetons laisse passer les messages des autres bots."""
+        self.runtime.session.post = Mock(return_value=Mock(status_code=200))
+        self.hello_bot.rate_limiter = RateLimiter(rate=20, burst=1)
+        self.hello_bot.send_message([{"chat_id": "1", "text": "a1"}, {"chat_id": "1", "text": "a2"}])
+        self.bye_bot.send_message({"chat_id": "2", "text": "b"})
+        for _ in range(2):
+            self.runtime._outgoing.put(None)
+
+        # Le premier thread s'arrête aussitôt ; le dernier envoie le message différé
+        self.runtime._sender()
+        self.runtime._sender()
+
+        sent = [c.kwargs["json"]["text"] for c in self.runtime.session.post.call_args_list]
+        self.assertEqual(sent, ["a1", "b", "a2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests unitaires pour le module tracing."""
+
+import io
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.handler import TelegramHandler
+from venantvr.telegram.tracing import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    """Tests pour la classe Tracer."""
+
+    def test_disabled_by_default(self):
+        """Test qu'aucune trace n'est ouverte sans échantillonnage."""
+        tracer = Tracer(sample_rate=0)
+
+        self.assertIsNone(tracer.begin("bot-1"))
+        self.assertIsNone(tracer.adopt(None))
+        self.assertEqual(tracer.dump(), [])
+
+    def test_span_finished_when_released(self):
+        """Test qu'une trace n'est close qu'une fois toutes ses étapes terminées."""
+        tracer = Tracer(sample_rate=1)
+        span = tracer.begin("bot-1")
+        tracer.hold(span)
+        tracer.hold(span)
+        span.event("handler", command="/price", ms=1.5)
+
+        tracer.release(span)
+        self.assertEqual(tracer.dump(), [])
+        tracer.release(span)
+
+        lines = tracer.dump()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith(span.trace_id))
+        self.assertIn("handler command=/price ms=1.5", lines[0])
+
+    def test_ring_buffer_and_dump_stream(self):
+        """Test que seules les dernières traces sont conservées."""
+        tracer = Tracer(sample_rate=1, capacity=2)
+        for i in range(5):
+            span = tracer.begin(f"bot-{i}")
+            tracer.hold(span)
+            tracer.release(span)
+        stream = io.StringIO()
+
+        lines = tracer.dump(stream)
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("bot-3"))
+        self.assertEqual(stream.getvalue().count("\n"), 2)
+
+    def test_active_spans_bounded(self):
+        """Test que les traces jamais closes sont évincées."""
+        tracer = Tracer(sample_rate=1, max_active=2)
+        for i in range(3):
+            tracer.begin(f"bot-{i}")
+
+        self.assertEqual(len(tracer._active), 2)
+        self.assertIn("evicted", tracer.dump()[0])
+
+
+class TestBotTracing(unittest.TestCase):
+    """Tests du traçage de bout en bout dans le bot."""
+
+    def test_correlation_across_stages(self):
+        """Test qu'une même trace couvre dispatch, handler et send."""
+        handler = Mock(spec=TelegramHandler)
+        handler.process_command.return_value = {"text": "42"}
+        with patch("venantvr.telegram.bot.threading.Thread"):
+            bot = TelegramBot("123:ABC", "1", handler)  # type: ignore[arg-type]
+        bot.registry = {"/price": {"action": Mock(__name__="bonjour"), "asks": []}}
+        bot.tracer.sample_rate = 1
+        bot._session = Mock()
+        span = bot.tracer.begin("123-1")
+        update = {"update_id": 1, "message": {"text": "/price", "chat": {"id": 1}, "date": time.time()},
+                  "_received_at": time.time(), "_trace": span.trace_id}
+
+        bot._process_update(update)
+        payload = bot.outgoing_queue.get_nowait()
+        self.assertEqual(payload["_trace"], span.trace_id)
+        bot._deliver(payload)
+
+        self.assertNotIn("_trace", bot._session.post.call_args.kwargs["json"])
+        stages = [stage for _, stage, _ in span.events]
+        self.assertEqual(stages, ["dispatch", "handler", "send"])
+        self.assertEqual(len(bot.tracer.dump()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
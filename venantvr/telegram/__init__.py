@@ -3,8 +3,10 @@
 from venantvr.telegram.bot import TelegramBot
 from venantvr.telegram.decorators import command
 from venantvr.telegram.handler import TelegramHandler
+from venantvr.telegram.runtime import BotRuntime
 
 __all__ = [
+    "BotRuntime",
     "TelegramBot",
     "TelegramHandler",
     "command",
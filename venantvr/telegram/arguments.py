@@ -0,0 +1,271 @@
+"""Schéma des arguments de commande, compilé à l'enregistrement par `@command`."""
+
+import datetime
+import enum
+import inspect
+import re
+import typing
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Converter = Callable[[Any], Any]
+
+_QUOTED_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+_TRUE_WORDS = frozenset({"1", "true", "yes", "y", "on", "oui", "o", "vrai"})
+_FALSE_WORDS = frozenset({"0", "false", "no", "n", "off", "non", "faux"})
+_MISSING = inspect.Parameter.empty
+
+
+class ArgumentError(ValueError):
+    """Argument invalide ; le message est destiné à l'utilisateur."""
+
+
+def split_arguments(text: str) -> List[str]:
+    """Découpe une ligne de commande en arguments.
+
+    Les espaces multiples sont ignorés et un argument peut contenir des espaces
+    s'il est entre guillemets doubles (`\\"` pour un guillemet littéral). Les
+    apostrophes ne sont pas des délimiteurs : `l'ordre` reste un seul mot.
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        Liste des arguments
+    """
+    if '"' not in text:
+        return text.split()
+    return [bare or quoted.replace('\\"', '"') for quoted, bare in _QUOTED_TOKEN.findall(text)]
+
+
+def _number(kind: type) -> Converter:
+    """Convertisseur numérique acceptant aussi la virgule décimale."""
+
+    def convert(raw: Any) -> Any:
+        try:
+            return kind(raw)
+        except (ValueError, ArithmeticError):
+            if isinstance(raw, str) and "," in raw:
+                return convert(raw.replace(",", "."))
+            raise ValueError(f"nombre invalide: {raw!r}") from None
+
+    return convert
+
+
+def _boolean(raw: Any) -> bool:
+    if isinstance(raw, bool):
+        return raw
+    word = str(raw).strip().lower()
+    if word in _TRUE_WORDS:
+        return True
+    if word in _FALSE_WORDS:
+        return False
+    raise ValueError(f"booléen invalide: {raw!r}")
+
+
+def _enumeration(kind: "type[enum.Enum]") -> Converter:
+    """Convertisseur vers un Enum, par nom ou par valeur (insensible à la casse)."""
+    members: Dict[str, enum.Enum] = {}
+    for member in kind:
+        for key in (str(member.value), member.name):
+            members.setdefault(key, member)
+            members.setdefault(key.lower(), member)
+
+    def convert(raw: Any) -> enum.Enum:
+        if isinstance(raw, kind):
+            return raw
+        member = members.get(raw) or members.get(str(raw).strip().lower())
+        if member is None:
+            raise ValueError(f"valeur inconnue: {raw!r}")
+        return member
+
+    return convert
+
+
+def _date(raw: Any) -> datetime.date:
+    if isinstance(raw, datetime.date):
+        return raw
+    text = str(raw).strip()
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        return datetime.datetime.strptime(text, "%d/%m/%Y").date()
+
+
+def _datetime(raw: Any) -> datetime.datetime:
+    if isinstance(raw, datetime.datetime):
+        return raw
+    return datetime.datetime.fromisoformat(str(raw).strip())
+
+
+def _first_of(converters: Sequence[Converter]) -> Converter:
+    """Convertisseur essayant plusieurs conversions dans l'ordre (Union)."""
+
+    def convert(raw: Any) -> Any:
+        for converter in converters[:-1]:
+            try:
+                return converter(raw)
+            except (ValueError, TypeError):
+                pass
+        return converters[-1](raw)
+
+    return convert
+
+
+def _type_name(expected: Any) -> str:
+    if isinstance(expected, type):
+        if issubclass(expected, enum.Enum):
+            return " | ".join(member.name.lower() for member in expected)
+        return expected.__name__
+    return getattr(expected, "__name__", str(expected).replace("typing.", ""))
+
+
+def resolve_converter(expected: Any) -> Tuple[Optional[Converter], bool]:
+    """Retourne le convertisseur d'un type attendu.
+
+    Types reconnus : `str`, `int`, `float` et `Decimal` (virgule décimale acceptée),
+    `bool` (oui/non, true/false, 1/0...), sous-classes d'`Enum` (par nom ou valeur),
+    `date` (ISO ou JJ/MM/AAAA), `datetime` (ISO), `Optional[...]` et `Union[...]`.
+    Tout autre appelable est utilisé tel quel.
+
+    Args:
+        expected: Type ou appelable déclaré dans `kwargs_types`
+
+    Returns:
+        Tuple (convertisseur ou None pour `str`, True si le type admet None)
+    """
+    if typing.get_origin(expected) is typing.Union:
+        members = [member for member in typing.get_args(expected) if member is not type(None)]
+        converters = [resolve_converter(member)[0] or str for member in members]
+        nullable = len(members) < len(typing.get_args(expected))
+        return (converters[0] if len(converters) == 1 else _first_of(converters)), nullable
+    if expected is str:
+        return None, False
+    if expected is bool:
+        return _boolean, False
+    if expected in (int, float, Decimal):
+        return _number(expected), False
+    if expected is datetime.datetime:
+        return _datetime, False
+    if expected is datetime.date:
+        return _date, False
+    if isinstance(expected, type) and issubclass(expected, enum.Enum):
+        return _enumeration(expected), False
+    return expected, False
+
+
+class ArgumentSpec:
+    """Argument d'une commande : nom, conversion et valeur par défaut."""
+
+    __slots__ = ("name", "converter", "type_name", "default")
+
+    def __init__(self, name: str, expected: Any = str, default: Any = _MISSING) -> None:
+        converter, nullable = resolve_converter(expected)
+        self.name = name
+        self.converter = converter
+        self.type_name = _type_name(expected)
+        self.default = None if nullable and default is _MISSING else default
+
+    @property
+    def required(self) -> bool:
+        return self.default is _MISSING
+
+    def convert(self, raw: Any) -> Any:
+        """Convertit une valeur brute.
+
+        Raises:
+            ArgumentError: Si la valeur ne peut pas être convertie
+        """
+        if self.converter is None:
+            return raw
+        try:
+            return self.converter(raw)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ArgumentError(f"L'argument '{raw}' pour '{self.name}' est invalide. "
+                                f"Type attendu: {self.type_name}.") from e
+
+
+class ArgumentSchema:
+    """Liste ordonnée des arguments d'une commande, compilée une seule fois."""
+
+    __slots__ = ("command", "specs", "required_count")
+
+    def __init__(self, command: str, specs: List[ArgumentSpec]) -> None:
+        self.command = command
+        self.specs = specs
+        self.required_count = sum(1 for spec in specs if spec.required)
+
+    @classmethod
+    def compile(cls, command: str, func: Callable[..., Any],
+                kwargs_types: Optional[Dict[str, Any]] = None) -> "ArgumentSchema":
+        """Construit le schéma d'une commande à partir de la signature de sa fonction.
+
+        Args:
+            command: Nom de la commande
+            func: Fonction de la commande
+            kwargs_types: Types ou convertisseurs par nom d'argument (str par défaut)
+
+        Returns:
+            Le schéma compilé
+        """
+        kwargs_types = kwargs_types or {}
+        specs = [ArgumentSpec(param.name, kwargs_types.get(param.name, str), param.default)
+                 for param in inspect.signature(func).parameters.values()
+                 if param.name != "self" and param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)]
+        return cls(command, specs)
+
+    @classmethod
+    def from_details(cls, details: Dict[str, Any]) -> "ArgumentSchema":
+        """Retourne le schéma d'un détail de commande, en le construisant s'il n'a pas été compilé."""
+        schema = details.get("schema")
+        if schema is None:
+            kwargs_types = details.get("kwargs_types") or {}
+            schema = cls(details.get("name", ""), [ArgumentSpec(name, kwargs_types.get(name, str))
+                                                   for name in details.get("arg_names", [])])
+        return schema
+
+    def arity_error(self, received: int) -> Optional[str]:
+        """Retourne le message d'erreur si le nombre d'arguments est incorrect, sinon None."""
+        if self.required_count <= received <= len(self.specs):
+            return None
+        expected = (str(len(self.specs)) if self.required_count == len(self.specs)
+                    else f"{self.required_count} à {len(self.specs)}")
+        return f"Erreur: Nombre d'arguments incorrect. Attendu: {expected}, Reçu: {received}"
+
+    def parse(self, arguments: Sequence[Any]) -> Dict[str, Any]:
+        """Convertit les arguments reçus en paramètres nommés.
+
+        Les arguments optionnels absents prennent leur valeur par défaut.
+
+        Args:
+            arguments: Arguments bruts, dans l'ordre de la signature
+
+        Returns:
+            Dict des paramètres convertis
+
+        Raises:
+            ArgumentError: Si le nombre d'arguments ou l'un d'eux est invalide
+        """
+        if len(arguments) != len(self.specs):
+            error = self.arity_error(len(arguments))
+            if error is not None:
+                raise ArgumentError(error)
+        kwargs = {}
+        for spec, raw in zip(self.specs, arguments):
+            kwargs[spec.name] = raw if spec.converter is None else spec.convert(raw)
+        for spec in self.specs[len(arguments):]:
+            kwargs[spec.name] = spec.default
+        return kwargs
+
+    def validate_step(self, index: int, raw: Any) -> None:
+        """Valide la réponse à une question d'un prompt, dès sa saisie.
+
+        Args:
+            index: Position de l'argument
+            raw: Réponse de l'utilisateur
+
+        Raises:
+            ArgumentError: Si la réponse ne peut pas être convertie
+        """
+        if index < len(self.specs):
+            self.specs[index].convert(raw)
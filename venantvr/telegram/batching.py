@@ -0,0 +1,141 @@
+"""Regroupement des appels d'une commande pour les servir en un seul appel de handler."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from venantvr.telegram.config import Config
+from venantvr.telegram.tracing import Span
+
+logger = logging.getLogger(__name__)
+
+BatchItem = Tuple[Dict[str, Any], str, Optional[Span]]
+Deliver = Callable[[str, Any, Optional[Span]], None]
+
+
+class _PendingBatch:
+    """Appels en attente d'une même commande."""
+
+    __slots__ = ("command", "func", "deadline", "items")
+
+    def __init__(self, command: str, func: Callable[[List[Dict[str, Any]]], List[Any]], deadline: float) -> None:
+        self.command = command
+        self.func = func
+        self.deadline = deadline
+        self.items: List[BatchItem] = []
+
+
+class CommandBatcher:
+    """Accumule les appels d'une commande pendant une courte fenêtre.
+
+    Le premier appel ouvre la fenêtre ; à son échéance, ou dès `max_size` appels,
+    la méthode de lot du handler est appelée une seule fois avec la liste des
+    arguments de chaque appel, et doit retourner une réponse par appel, dans le
+    même ordre. Chaque réponse est ensuite remise au chat qui l'a demandée.
+
+    Les lots sont exécutés par un thread dédié, démarré au premier appel. Après
+    `close()`, les appels sont servis immédiatement, un par un.
+    """
+
+    def __init__(self, deliver: Deliver, max_size: int = Config.BATCH_MAX_SIZE) -> None:
+        """Initialise le regroupement.
+
+        Args:
+            deliver: Fonction appelée avec (chat_id, réponse, trace) pour chaque appel servi
+            max_size: Nombre d'appels déclenchant l'exécution immédiate d'un lot
+        """
+        self._deliver = deliver
+        self._max_size = max_size
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, key: Hashable, command: str, func: Callable[[List[Dict[str, Any]]], List[Any]], window: float,
+               kwargs: Dict[str, Any], chat_id: str, span: Optional[Span] = None) -> None:
+        """Ajoute un appel au lot de sa commande.
+
+        Args:
+            key: Clé du lot (handler et commande)
+            command: Nom de la commande
+            func: Méthode de lot du handler
+            window: Durée maximale d'attente du lot, en secondes
+            kwargs: Arguments convertis de l'appel
+            chat_id: Chat destinataire de la réponse
+            span: Trace de la mise à jour, si elle est échantillonnée
+        """
+        with self._cond:
+            if self._closed:
+                ready = _PendingBatch(command, func, 0.0)
+                ready.items.append((kwargs, chat_id, span))
+            else:
+                batch = self._pending.get(key)
+                if batch is None:
+                    batch = self._pending[key] = _PendingBatch(command, func, time.monotonic() + window)
+                    if self._thread is None:
+                        self._thread = threading.Thread(target=self._run, daemon=True, name="batcher")
+                        self._thread.start()
+                    self._cond.notify()
+                batch.items.append((kwargs, chat_id, span))
+                if len(batch.items) < self._max_size:
+                    return
+                ready = self._pending.pop(key)
+        self._execute(ready)
+
+    def _run(self) -> None:
+        """Thread d'exécution des lots arrivés à échéance."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    due = [key for key, batch in self._pending.items() if batch.deadline <= now]
+                    if due:
+                        break
+                    next_deadline = min((batch.deadline for batch in self._pending.values()), default=None)
+                    self._cond.wait(None if next_deadline is None else next_deadline - now)
+                batches = [self._pending.pop(key) for key in due]
+            for batch in batches:
+                self._execute(batch)
+
+    def _execute(self, batch: _PendingBatch) -> None:
+        """Appelle la méthode de lot et remet chaque réponse à son chat."""
+        started = time.perf_counter()
+        try:
+            responses = list(batch.func([kwargs for kwargs, _, _ in batch.items]))
+            if len(responses) != len(batch.items):
+                raise ValueError(f"{len(responses)} réponse(s) pour {len(batch.items)} appel(s)")
+        except Exception as e:
+            logger.error(f"Error in batch {batch.command}: {e}", exc_info=True)
+            responses = [{"text": f"Erreur lors du traitement: {str(e)}"} for _ in batch.items]
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.debug("Batch %s: %s call(s) in %s ms", batch.command, len(batch.items), elapsed_ms)
+        for (_, chat_id, span), response in zip(batch.items, responses):
+            if span is not None:
+                span.event("batch", command=batch.command, size=len(batch.items), ms=elapsed_ms)
+            self._deliver(chat_id, response, span)
+
+    def flush(self) -> None:
+        """Exécute immédiatement tous les lots en attente."""
+        with self._cond:
+            batches = list(self._pending.values())
+            self._pending.clear()
+        for batch in batches:
+            self._execute(batch)
+
+    def close(self) -> None:
+        """Exécute les lots en attente et arrête le thread ; les appels suivants ne sont plus regroupés."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def reopen(self) -> None:
+        """Réactive le regroupement après un `close()` (redémarrage du bot)."""
+        with self._cond:
+            self._closed = False
@@ -1,42 +1,86 @@
 """Module principal pour le bot Telegram avec gestion des commandes et menus."""
 
+import functools
+import json
 import logging
 import queue
+import random
 import threading
 import time
-from typing import Dict, List, Optional, Union
-
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Type, Union
 
+from venantvr.telegram.arguments import ArgumentError, ArgumentSchema, split_arguments
+from venantvr.telegram.batching import CommandBatcher
 from venantvr.telegram.classes.command import Command
 from venantvr.telegram.classes.enums import DynamicEnumMember
 from venantvr.telegram.classes.menu import Menu
-from venantvr.telegram.decorators import COMMAND_REGISTRY
-from venantvr.telegram.protocols import HandlerProtocol
+from venantvr.telegram.classes.types import PromptState
+from venantvr.telegram.config import Config
+from venantvr.telegram.debounce import UpdateDebouncer
+from venantvr.telegram.decorators import CommandSpec, build_registry
+from venantvr.telegram.handler import TelegramHandler, format_help
+from venantvr.telegram.metrics import BotMetrics
+from venantvr.telegram.pagination import PAGE_CALLBACK_PREFIX, CursorStore, PageCursor
+from venantvr.telegram.profiling import HandlerProfiler
+from venantvr.telegram.protocols import HandlerProtocol, RuntimeProtocol
+from venantvr.telegram.ratelimit import RateLimiter
+from venantvr.telegram.tracing import Span, Tracer
+
+if TYPE_CHECKING:
+    import requests
+
+    from venantvr.telegram.outbox import SqliteOutbox
 
 logger = logging.getLogger(__name__)
 
 
 class TelegramBot:
-    """Bot Telegram avec gestion asynchrone des messages et commandes."""
+    """Bot Telegram avec gestion asynchrone des messages et commandes.
 
-    def __init__(self, bot_token: str, chat_id: str, handlers: Optional[Union[List[HandlerProtocol], HandlerProtocol]] = None) -> None:
+    La construction est légère : aucun thread n'est lancé et `requests` n'est
+    importé qu'au `start()`. `stop()` vide les files avant de rendre la main.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str,
+                 handlers: Optional[Union[List[HandlerProtocol], HandlerProtocol]] = None,
+                 runtime: Optional[RuntimeProtocol] = None, admin_chat_ids: Optional[List[str]] = None,
+                 outbox: Optional["SqliteOutbox"] = None) -> None:
         """Initialise le bot Telegram.
 
         Args:
             bot_token: Token d'authentification du bot
             chat_id: ID du chat par défaut
             handlers: Handler(s) pour traiter les commandes
+            runtime: Runtime (`BotRuntime`, `ProcessCluster`) qui fournit la session HTTP
+                et se charge de la réception, du traitement et de l'envoi ; à défaut,
+                le bot crée ses propres threads
+            admin_chat_ids: Chats autorisés à utiliser les commandes d'administration (`/profile`)
+            outbox: Outbox persistante remplaçant `outgoing_queue` (messages conservés
+                jusqu'à une réponse 2xx, y compris après un redémarrage) ; réservée aux
+                bots sans runtime
         """
+        if outbox is not None and runtime is not None:
+            raise ValueError("Une outbox persistante ne peut pas être utilisée avec un runtime partagé.")
         self.api_url: str = f"https://api.telegram.org/bot{bot_token}"
         self.chat_id: str = chat_id
+        self.name: str = bot_token.split(":")[0]
         self.last_update_id: Optional[int] = None
         self.incoming_queue: queue.Queue = queue.Queue()
         self.outgoing_queue: queue.Queue = queue.Queue()
-        self.active_prompts: Dict[str, Dict] = {}
-        self._session = self._create_session()
+        self.active_prompts: Dict[str, PromptState] = {}
+        self.metrics = BotMetrics()
+        self.rate_limiter = RateLimiter()
+        self._last_backlog_report = 0.0
+        self.cursors = CursorStore()
+        self.tracer = Tracer()
+        self.profiler = HandlerProfiler()
+        self.admin_chat_ids = {str(admin_chat_id) for admin_chat_id in admin_chat_ids or []}
+        self._runtime = runtime
+        self._session: Optional[requests.Session] = None
+        self._stop_event = threading.Event()
+        self.outbox = outbox
+        self._drain_event = threading.Event()
 
         # Accept single handler or list
         self.handlers: List[HandlerProtocol] = []
@@ -45,19 +89,79 @@ class TelegramBot:
                 self.handlers = list(handlers)
             else:
                 self.handlers = [handlers]
+        # Commandes et menus propres à ce bot
+        self.registry: Dict[str, CommandSpec] = build_registry(self.handlers)
+        self._debouncer = UpdateDebouncer(self.registry)
+        self._batcher = CommandBatcher(self._deliver_batch_response)
 
-        self._threads = [
-            threading.Thread(target=self._receiver, daemon=True, name="receiver"),
-            threading.Thread(target=self._sender, daemon=True, name="sender"),
-            threading.Thread(target=self._processor, daemon=True, name="processor")
-        ]
-        for thread in self._threads:
-            thread.start()
+        self._threads: List[threading.Thread] = []
         logger.info(f"Bot initialisé. Token: {bot_token[:10]}..., Chat ID: {chat_id}")
 
+    def __enter__(self) -> "TelegramBot":
+        return self.start()
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.stop(Config.STOP_TIMEOUT)
+
+    def start(self) -> "TelegramBot":
+        """Ouvre la session HTTP et démarre les threads du bot.
+
+        Un bot rattaché à un runtime utilise la session de celui-ci et lui délègue
+        le démarrage de sa réception.
+
+        Returns:
+            Le bot lui-même, pour chaîner `bot = TelegramBot(...).start()`
+        """
+        if self._threads:
+            logger.warning("Bot déjà démarré.")
+            return self
+        self._stop_event.clear()
+        self._drain_event.clear()
+        self._batcher.reopen()
+        # Un `stop()` précédent a pu laisser ses signaux d'arrêt en file
+        self._discard_sentinels(self.incoming_queue)
+        self._discard_sentinels(self.outgoing_queue)
+        if self._runtime is not None:
+            self._session = self._runtime.session
+            self._runtime.attach(self)
+        else:
+            self._session = self._create_session()
+            self._threads = [
+                threading.Thread(target=self._receiver, daemon=True, name="receiver"),
+                threading.Thread(target=self._outbox_sender if self.outbox else self._sender, daemon=True,
+                                 name="sender"),
+                threading.Thread(target=self._processor, daemon=True, name="processor")
+            ]
+            for thread in self._threads:
+                thread.start()
+        logger.info(f"Bot {self.name} démarré.")
+        return self
+
     @staticmethod
-    def _create_session() -> requests.Session:
-        """Crée une session HTTP avec retry strategy."""
+    def _discard_sentinels(pending: queue.Queue) -> None:
+        """Retire d'une file les signaux d'arrêt (None) en conservant les autres éléments."""
+        with pending.mutex:
+            items = [item for item in pending.queue if item is not None]
+            removed = len(pending.queue) - len(items)
+            pending.queue.clear()
+            pending.queue.extend(items)
+            pending.unfinished_tasks = max(pending.unfinished_tasks - removed, 0)
+
+    @staticmethod
+    def _create_session(pool_size: int = Config.HTTP_POOL_SIZE) -> "requests.Session":
+        """Crée une session HTTP avec retry strategy.
+
+        `requests` et `urllib3` sont importés ici plutôt qu'au chargement du module,
+        pour que l'import du paquet et la construction du bot restent rapides.
+
+        Args:
+            pool_size: Nombre de connexions conservées par hôte
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         session = requests.Session()
         retry = Retry(
             total=3,
@@ -66,13 +170,12 @@ class TelegramBot:
             backoff_factor=0.3,
             status_forcelist=(500, 502, 504)
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
         session.mount('http://', adapter)
         session.mount('https://', adapter)
         return session
 
-    @staticmethod
-    def _build_menu_keyboard(menu_str: str) -> Dict[str, Union[str, Dict]]:  # noqa: PLR6301
+    def _build_menu_keyboard(self, menu_str: str) -> Dict[str, Union[str, Dict]]:
         """Construit un clavier de menu interactif.
 
         Args:
@@ -87,36 +190,157 @@ class TelegramBot:
             logger.error(f"Menu error: {e}")
             return {"text": f"Erreur: Menu '{menu_str}' non valide."}
         buttons = []
-        for cmd_details in COMMAND_REGISTRY.values():
+        # Un menu inconnu (None) n'a aucune commande : il ne doit pas capter celles sans menu
+        for cmd_details in self.registry.values() if menu_enum is not None else ():
             if cmd_details.get('menu') == menu_enum:
                 button_text = cmd_details['enum'].name.capitalize()
                 buttons.append([{"text": button_text, "callback_data": cmd_details['enum'].value}])
-        logger.debug(f"Menu {menu_str} buttons: {buttons}")
+        logger.debug("Menu %s buttons: %s", menu_str, buttons)
         return {
             "text": "Veuillez choisir une option :" if buttons else "Aucune option disponible pour ce menu.",
             "reply_markup": {"inline_keyboard": buttons}
         }
 
     def _receiver(self) -> None:
-        """Thread de réception des messages depuis l'API Telegram."""
-        while True:
+        """Thread de réception des messages depuis l'API Telegram.
+
+        Chaque cycle de long polling ne demande que les types de mises à jour que
+        le bot sait traiter (`allowed_updates`) et réduit `limit` à mesure que la
+        file de traitement se remplit ; au-delà de `Config.POLL_PAUSE_BACKLOG`
+        mises à jour en attente, la réception est suspendue. Les erreurs sont
+        suivies d'une attente exponentielle avec jitter, remise à zéro au premier
+        succès.
+        """
+        import requests
+
+        error_streak = 0
+        while not self._stop_event.is_set():
+            backlog = self._incoming_backlog()
+            if backlog >= Config.POLL_PAUSE_BACKLOG:
+                self.metrics.increment("poll_paused")
+                self._stop_event.wait(Config.POLL_PAUSE)
+                continue
             try:
-                params = {"timeout": 30}
-                if self.last_update_id:
-                    params["offset"] = self.last_update_id + 1
-                response = self._session.get(f"{self.api_url}/getUpdates", params=params, timeout=35)
+                params = self._poll_params(backlog)
+                response = self._session.get(f"{self.api_url}/getUpdates", params=params,
+                                             timeout=Config.POLL_TIMEOUT + Config.SEND_TIMEOUT)
+                if self._stop_event.is_set():
+                    # Offset non confirmé : ces mises à jour seront renvoyées au prochain démarrage
+                    break
                 response.raise_for_status()
                 updates = response.json().get("result", [])
-                for update in updates:
-                    self.last_update_id = update["update_id"]
-                    self.incoming_queue.put(update)
-                    logger.debug(f"Received update: {update}")
+                error_streak = 0
+                self._record_poll(len(updates), params["limit"])
+                if updates:
+                    self.last_update_id = updates[-1]["update_id"]
+                received_at = time.time()
+                for update in self._debouncer.filter(updates):
+                    update["_received_at"] = received_at
+                    span = self.tracer.begin(f"{self.name}-{update['update_id']}")
+                    if span is not None:
+                        span.event("receive", batch=len(updates))
+                        update["_trace"] = span.trace_id
+                    self._enqueue_update(update)
+                    logger.debug("Received update: %s", update)
             except requests.RequestException as e:
+                if self._stop_event.is_set():
+                    break
+                error_streak += 1
                 logger.error(f"Request error in _receiver: {e}")
-                time.sleep(3)
+                self._stop_event.wait(self._poll_backoff(error_streak, e))
             except Exception as e:
+                error_streak += 1
                 logger.error(f"Unexpected error in _receiver: {e}")
-                time.sleep(3)
+                self._stop_event.wait(self._poll_backoff(error_streak, e))
+
+    def _allowed_updates(self) -> List[str]:
+        """Retourne les types de mises à jour traités par le bot.
+
+        Seuls les messages texte et les boutons inline sont traités : les autres
+        types (messages modifiés, canaux, requêtes inline...) ne sont pas demandés.
+        Les boutons n'existent que si le bot sert des commandes (menus, pagination).
+        """
+        if Config.POLL_ALLOWED_UPDATES is not None:
+            return list(Config.POLL_ALLOWED_UPDATES)
+        return ["message", "callback_query"] if self.registry else ["message"]
+
+    def _poll_params(self, backlog: int) -> Dict[str, Union[int, str]]:
+        """Construit les paramètres du prochain `getUpdates`.
+
+        Args:
+            backlog: Nombre de mises à jour en attente de traitement
+
+        Returns:
+            Paramètres de la requête
+        """
+        params: Dict[str, Union[int, str]] = {
+            "timeout": Config.POLL_TIMEOUT,
+            "limit": self._poll_limit(backlog),
+            "allowed_updates": json.dumps(self._allowed_updates())
+        }
+        if self.last_update_id:
+            params["offset"] = self.last_update_id + 1
+        return params
+
+    @staticmethod
+    def _poll_limit(backlog: int) -> int:
+        """Retourne le lot à demander, réduit proportionnellement à la file de traitement.
+
+        Le lot décroît de `Config.POLL_MAX_LIMIT` (file vide) à `Config.POLL_MIN_LIMIT`
+        à l'approche de `Config.POLL_PAUSE_BACKLOG` : sous charge, chaque aller-retour
+        `getUpdates` ramène encore plusieurs mises à jour.
+        """
+        free = max(Config.POLL_PAUSE_BACKLOG - backlog, 0) / max(Config.POLL_PAUSE_BACKLOG, 1)
+        return max(Config.POLL_MIN_LIMIT, int(Config.POLL_MAX_LIMIT * free))
+
+    def _record_poll(self, batch_size: int, limit: int) -> None:
+        """Met à jour les métriques d'un cycle de long polling réussi."""
+        self.metrics.increment("polls")
+        if not batch_size:
+            self.metrics.increment("empty_polls")
+        self.metrics.set_gauge("poll_batch_size", batch_size)
+        self.metrics.set_gauge("poll_limit", limit)
+        self.metrics.set_gauge("poll_error_streak", 0)
+
+    def _poll_backoff(self, error_streak: int, error: Exception) -> float:
+        """Retourne l'attente avant le prochain `getUpdates` après une erreur.
+
+        L'attente double à chaque erreur consécutive, dans la limite de
+        `Config.POLL_BACKOFF_MAX`, et est tirée au hasard entre la moitié et la
+        totalité de cette valeur pour désynchroniser les bots. Un `retry_after`
+        renvoyé par Telegram (429) est respecté.
+
+        Args:
+            error_streak: Nombre d'erreurs consécutives
+            error: Dernière erreur
+
+        Returns:
+            Durée d'attente en secondes
+        """
+        self.metrics.increment("poll_errors")
+        self.metrics.set_gauge("poll_error_streak", error_streak)
+        delay = min(Config.POLL_BACKOFF_MAX, Config.POLL_BACKOFF_BASE * 2 ** (error_streak - 1))
+        delay = random.uniform(delay / 2, delay)
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code == 429:
+            try:
+                delay = max(delay, float(response.json()["parameters"]["retry_after"]))
+            except (ValueError, KeyError, TypeError):
+                pass
+        return delay
+
+    def _incoming_backlog(self) -> int:
+        """Retourne le nombre de mises à jour en attente de traitement (file propre ou partagée)."""
+        if self._runtime is not None:
+            return self._runtime.backlog(self)
+        return self.incoming_queue.qsize()
+
+    def _enqueue_update(self, update: Dict) -> None:
+        """Transmet une mise à jour au thread de traitement (propre ou partagé)."""
+        if self._runtime is not None:
+            self._runtime.submit_update(self, update)
+        else:
+            self.incoming_queue.put(update)
 
     def _sender(self) -> None:
         """Thread d'envoi des messages vers l'API Telegram."""
@@ -124,18 +348,79 @@ class TelegramBot:
             payload = self.outgoing_queue.get()
             if payload is None:
                 break
-            try:
-                response = self._session.post(f"{self.api_url}/sendMessage", json=payload, timeout=10)
-                logger.debug(f"Sent message: {payload}, Response: {response.json()}")
-            except Exception as e:
-                logger.error(f"Error in _sender: {e}")
+            self._deliver(payload)
             self.outgoing_queue.task_done()
 
-    def _find_handler_for_command(self, command_enum: Union[Command, DynamicEnumMember, None]) -> Optional[HandlerProtocol]:
+    def _outbox_sender(self) -> None:
+        """Thread d'envoi des messages de l'outbox persistante.
+
+        Un message est retiré de l'outbox sur une réponse 2xx ; sinon il est retenté
+        plus tard, ou déplacé en dead letter si l'erreur est définitive (4xx hors 429).
+        À l'arrêt, les messages prêts sont envoyés ; ceux en attente d'une nouvelle
+        tentative restent dans l'outbox pour le prochain démarrage.
+        """
+        while True:
+            item = self.outbox.get(timeout=Config.OUTBOX_POLL_INTERVAL)
+            if item is None:
+                if self._drain_event.is_set():
+                    break
+                continue
+            row_id, payload = item
+            status = self._deliver(payload)
+            if status is not None and 200 <= status < 300:
+                self.outbox.ack(row_id)
+            elif self.outbox.fail(row_id, f"HTTP {status}" if status else "erreur réseau",
+                                  permanent=status is not None and 400 <= status < 500 and status != 429):
+                self.metrics.increment("outbox_retries")
+            else:
+                self.metrics.increment("dead_letters")
+        self.outbox.flush()
+
+    def _deliver(self, payload: Dict, throttle: bool = True) -> Optional[int]:
+        """Envoie un message à l'API Telegram en respectant le débit du bot.
+
+        Args:
+            payload: Message à envoyer ; `_method` choisit la méthode de l'API (`sendMessage` par défaut)
+            throttle: False si l'appelant a déjà réservé l'envoi auprès de `rate_limiter`
+
+        Returns:
+            Code HTTP de la réponse, ou None si la requête a échoué
+        """
+        span = self.tracer.adopt(payload.pop("_trace", None))
+        method = payload.pop("_method", "sendMessage")
+        if throttle:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        status = None
+        try:
+            response = self._session.post(f"{self.api_url}/{method}", json=payload, timeout=10)
+            status = response.status_code
+            if 200 <= status < 300:
+                self.metrics.increment("messages_sent")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sent message: %s, Response: %s", payload, response.json())
+            else:
+                self.metrics.increment("send_errors")
+                logger.warning(f"Message refusé par l'API (HTTP {status}): {response.text[:200]}")
+        except Exception as e:
+            self.metrics.increment("send_errors")
+            logger.error(f"Error in _sender: {e}")
+        if span is not None:
+            span.event("send", status=status, ms=round((time.perf_counter() - started) * 1000, 3))
+            self.tracer.release(span)
+        return status
+
+    @staticmethod
+    def _command_enum(command_details: CommandSpec, command_name: str) -> Optional[DynamicEnumMember]:
+        """Retourne le membre `Command` d'une commande du registre."""
+        return command_details.get("enum") or Command.define(command_name)
+
+    def _find_handler_for_command(self, command_enum: Union[Command, DynamicEnumMember, None]
+                                  ) -> Optional[HandlerProtocol]:
         """Retourne le handler qui a la méthode correspondant à la commande."""
         if command_enum is None:
             return None
-        cmd_details = COMMAND_REGISTRY.get(command_enum.value)
+        cmd_details = self.registry.get(command_enum.value)
         if not cmd_details:
             return None
         method_name = cmd_details["action"].__name__
@@ -144,112 +429,333 @@ class TelegramBot:
                 return handler
         return None
 
+    def _update_command_name(self, update: Dict) -> Optional[str]:
+        """Retourne le nom de la commande visée par une mise à jour, si elle est identifiable."""
+        if "message" in update and "text" in update["message"]:
+            chat_id = str(update["message"]["chat"]["id"])
+            if chat_id in self.active_prompts:
+                return self.active_prompts[chat_id]["command"]
+            return update["message"]["text"].split(' ')[0]
+        if "callback_query" in update:
+            return update["callback_query"].get("data")
+        return None
+
+    def _is_stale(self, update: Dict) -> bool:
+        """Indique si une mise à jour est trop ancienne pour être traitée.
+
+        L'âge retenu est le plus grand entre l'âge du message (`message.date`) et
+        le temps passé dans la file depuis la réception. Les callback_query n'ayant
+        pas d'horodatage, seul ce dernier s'applique. Le seuil vaut `max_age` de la
+        commande visée, à défaut `Config.MAX_UPDATE_AGE` ; `0` désactive le délestage.
+
+        Args:
+            update: Mise à jour reçue de l'API
+
+        Returns:
+            True si la mise à jour doit être ignorée
+        """
+        now = time.time()
+        queue_age = now - update.get("_received_at", now)
+        age = queue_age
+        message_date = update.get("message", {}).get("date")
+        if message_date:
+            age = max(age, now - message_date)
+        self.metrics.set_gauge("queue_age", round(queue_age, 3))
+        self.metrics.set_gauge("update_age", round(age, 3))
+        self.metrics.set_gauge("incoming_backlog", self._incoming_backlog())
+        self._report_backlog(now)
+
+        command_details = self.registry.get(self._update_command_name(update) or "")
+        max_age = command_details.get("max_age") if command_details else None
+        if max_age is None:
+            max_age = Config.MAX_UPDATE_AGE
+        if 0 < max_age < age:
+            self.metrics.increment("stale_dropped")
+            logger.info(f"Mise à jour {update.get('update_id')} ignorée: âge {age:.1f}s > {max_age}s")
+            return True
+        return False
+
+    def _report_backlog(self, now: float) -> None:
+        """Journalise périodiquement l'état de la file entrante tant qu'elle se vide."""
+        backlog = self._incoming_backlog()
+        if not backlog or now - self._last_backlog_report < Config.BACKLOG_REPORT_INTERVAL:
+            return
+        self._last_backlog_report = now
+        logger.info(f"File entrante: {backlog} mise(s) à jour en attente, "
+                    f"âge en file {self.metrics.get('queue_age')}s, "
+                    f"{self.metrics.get('stale_dropped')} périmée(s) ignorée(s)")
+
     def _processor(self) -> None:
         """Thread de traitement des messages et commandes."""
         while True:
             update = self.incoming_queue.get()
             if update is None:
                 break
-            logger.debug(f"Processing update: {update}")
-            # noinspection PyUnusedLocal
-            response_payload = None
-            chat_id = None
+            self._process_update(update)
+            self.incoming_queue.task_done()
+
+    def _process_update(self, update: Dict) -> None:
+        """Traite une mise à jour et met en file la réponse éventuelle.
+
+        Les erreurs sont journalisées sans être propagées : les threads de
+        traitement (propres, partagés ou processus) survivent à une mise à jour
+        en échec.
+
+        Args:
+            update: Mise à jour reçue de l'API
+        """
+        self.metrics.increment("updates_processed")
+        span = self.tracer.adopt(update.get("_trace"))
+        try:
+            if span is None:
+                self._dispatch_update(update, None)
+                return
+            self.tracer.hold(span)
+            span.event("dispatch", queue_ms=round((time.time() - update.get("_received_at", time.time())) * 1000, 3))
             try:
-                # Handle messages texte
-                if "message" in update and "text" in update["message"]:
-                    text = update["message"]["text"]
-                    chat_id = str(update["message"]["chat"]["id"])
-                    logger.debug(f"Received text: {text}, chat_id: {chat_id}")
-
-                    # Menu
-                    if text == "/menu":
-                        response_payload = self._build_menu_keyboard("/menu")
-                    elif chat_id in self.active_prompts:
-                        # Traitement des prompts en cours
-                        prompt_info = self.active_prompts[chat_id]
-                        command_name = prompt_info['command']
-                        command_details = COMMAND_REGISTRY.get(command_name)
-                        if not command_details:
-                            response_payload = {"text": f"Erreur: Commande '{command_name}' non trouvée."}
-                        else:
-                            prompt_info['arguments'].append(text)
-                            num_questions = len(command_details.get("asks", []))
-                            logger.debug(f"Prompt for {command_name}, args collected: {prompt_info['arguments']}, expected: {num_questions}")
-                            if len(prompt_info['arguments']) < num_questions:
-                                next_question_index = len(prompt_info['arguments'])
-                                response_payload = {"text": command_details["asks"][next_question_index]}
-                            else:
-                                cmd_enum = Command.from_value(command_name)
-                                handler = self._find_handler_for_command(cmd_enum)
-                                if handler and cmd_enum:
-                                    response_payload = handler.process_command(cmd_enum, prompt_info['arguments'])
-                                    del self.active_prompts[chat_id]
-                                elif not cmd_enum:
-                                    logger.error(f"Command enum not found for: {command_name}")
-                                    response_payload = {"text": f"Erreur: Commande '{command_name}' non valide."}
-                                else:
-                                    response_payload = {"text": "Erreur: Aucun handler trouvé pour cette commande."}
-                                    del self.active_prompts[chat_id]
+                self._dispatch_update(update, span)
+            finally:
+                self.tracer.release(span)
+        except Exception as e:
+            # Une réponse impossible à mettre en file ne doit pas arrêter le thread de traitement
+            self.metrics.increment("process_errors")
+            logger.error(f"Error in _process_update {update.get('update_id')}: {e}", exc_info=True)
+
+    def _dispatch_update(self, update: Dict, span: Optional[Span]) -> None:
+        """Exécute la commande visée par une mise à jour et met en file la réponse.
+
+        Args:
+            update: Mise à jour reçue de l'API
+            span: Trace de la mise à jour, si elle est échantillonnée
+        """
+        if self._is_stale(update):
+            if span is not None:
+                span.event("stale")
+            return
+        logger.debug("Processing update: %s", update)
+        # noinspection PyUnusedLocal
+        response_payload = None
+        chat_id = None
+        try:
+            # Handle messages texte
+            if "message" in update and "text" in update["message"]:
+                text = update["message"]["text"]
+                chat_id = str(update["message"]["chat"]["id"])
+                logger.debug("Received text: %s, chat_id: %s", text, chat_id)
+
+                # Menu
+                if text == "/menu":
+                    response_payload = self._build_menu_keyboard("/menu")
+                elif text.split(' ')[0] == "/profile" and chat_id in self.admin_chat_ids:
+                    report = self.profiler.command(text.split()[1:], dump_prefix=self.name)
+                    response_payload = {"text": report[:Config.MAX_MESSAGE_LENGTH]}
+                elif chat_id in self.active_prompts:
+                    # Traitement des prompts en cours
+                    prompt_info = self.active_prompts[chat_id]
+                    command_name = prompt_info['command']
+                    command_details = self.registry.get(command_name)
+                    if not command_details:
+                        response_payload = {"text": f"Erreur: Commande '{command_name}' non trouvée."}
                     else:
-                        command_name = text.split(' ')[0]
-                        command_details = COMMAND_REGISTRY.get(command_name)
-                        if command_details:
-                            if command_details.get("asks"):
-                                self.active_prompts[chat_id] = {'command': command_name, 'arguments': []}
-                                response_payload = {"text": command_details["asks"][0]}
-                            else:
-                                cmd_enum = Command.from_value(command_name)
-                                handler = self._find_handler_for_command(cmd_enum)
-                                if handler and cmd_enum:
-                                    response_payload = handler.process_command(cmd_enum, text.split(' ')[1:])
-                                elif not cmd_enum:
-                                    logger.error(f"Command enum not found for: {command_name}")
-                                    response_payload = {"text": f"Erreur: Commande '{command_name}' non valide."}
-                                else:
-                                    response_payload = {"text": "Erreur: Aucun handler trouvé pour cette commande."}
+                        error = self._prompt_answer_error(command_details, len(prompt_info['arguments']), text)
+                        if error is None:
+                            prompt_info['arguments'].append(text)
+                        num_questions = len(command_details.get("asks", []))
+                        logger.debug("Prompt for %s, args collected: %s, expected: %s", command_name,
+                                     prompt_info['arguments'], num_questions)
+                        if error is not None:
+                            response_payload = {"text": error}
+                        elif len(prompt_info['arguments']) < num_questions:
+                            next_question_index = len(prompt_info['arguments'])
+                            response_payload = {"text": command_details["asks"][next_question_index]}
                         else:
-                            response_payload = {"text": f"Commande '{command_name}' non reconnue."}
-
-                # Callback query (inline keyboard)
-                elif "callback_query" in update:
-                    callback_query = update["callback_query"]
-                    chat_id = str(callback_query["message"]["chat"]["id"])
-                    callback_data = callback_query.get("data")
-                    logger.debug(f"Received callback query: {callback_data}, chat_id: {chat_id}")
-                    if callback_data in COMMAND_REGISTRY:
-                        command_details = COMMAND_REGISTRY.get(callback_data)
+                            cmd_enum = self._command_enum(command_details, command_name)
+                            handler = self._find_handler_for_command(cmd_enum)
+                            if handler and cmd_enum:
+                                response_payload = self._run_handler(handler, cmd_enum, prompt_info['arguments'],
+                                                                     span, chat_id)
+                                del self.active_prompts[chat_id]
+                            elif not cmd_enum:
+                                logger.error(f"Command enum not found for: {command_name}")
+                                response_payload = {"text": f"Erreur: Commande '{command_name}' non valide."}
+                            else:
+                                response_payload = {"text": "Erreur: Aucun handler trouvé pour cette commande."}
+                                del self.active_prompts[chat_id]
+                else:
+                    command_name, _, raw_arguments = text.partition(' ')
+                    command_details = self.registry.get(command_name)
+                    if command_details:
                         if command_details.get("asks"):
-                            self.active_prompts[chat_id] = {'command': callback_data, 'arguments': []}
+                            self.active_prompts[chat_id] = PromptState(command_details.get('name') or command_name)
                             response_payload = {"text": command_details["asks"][0]}
                         else:
-                            cmd_enum = Command.from_value(callback_data)
+                            cmd_enum = self._command_enum(command_details, command_name)
                             handler = self._find_handler_for_command(cmd_enum)
                             if handler and cmd_enum:
-                                response_payload = handler.process_command(cmd_enum, [])
+                                response_payload = self._run_handler(handler, cmd_enum,
+                                                                     split_arguments(raw_arguments), span, chat_id)
                             elif not cmd_enum:
-                                logger.error(f"Callback command enum not found for: {callback_data}")
-                                response_payload = {"text": f"Erreur: Commande '{callback_data}' non valide."}
+                                logger.error(f"Command enum not found for: {command_name}")
+                                response_payload = {"text": f"Erreur: Commande '{command_name}' non valide."}
                             else:
                                 response_payload = {"text": "Erreur: Aucun handler trouvé pour cette commande."}
                     else:
-                        response_payload = {"text": f"Action '{callback_data}' non reconnue."}
+                        response_payload = {"text": f"Commande '{command_name}' non reconnue."}
 
+            # Callback query (inline keyboard)
+            elif "callback_query" in update:
+                callback_query = update["callback_query"]
+                chat_id = str(callback_query["message"]["chat"]["id"])
+                callback_data = callback_query.get("data")
+                logger.debug("Received callback query: %s, chat_id: %s", callback_data, chat_id)
+                if callback_data and callback_data.startswith(PAGE_CALLBACK_PREFIX):
+                    response_payload = self.cursors.render_callback(callback_data, chat_id)
+                    message_id = callback_query["message"].get("message_id")
+                    if message_id is not None:
+                        # La page remplace la précédente dans le même message
+                        response_payload.update(_method="editMessageText", message_id=message_id)
+                elif callback_data in self.registry:
+                    command_details = self.registry.get(callback_data)
+                    if command_details.get("asks"):
+                        self.active_prompts[chat_id] = PromptState(command_details.get('name') or callback_data)
+                        response_payload = {"text": command_details["asks"][0]}
+                    else:
+                        cmd_enum = self._command_enum(command_details, callback_data)
+                        handler = self._find_handler_for_command(cmd_enum)
+                        if handler and cmd_enum:
+                            response_payload = self._run_handler(handler, cmd_enum, [], span, chat_id)
+                        elif not cmd_enum:
+                            logger.error(f"Callback command enum not found for: {callback_data}")
+                            response_payload = {"text": f"Erreur: Commande '{callback_data}' non valide."}
+                        else:
+                            response_payload = {"text": "Erreur: Aucun handler trouvé pour cette commande."}
                 else:
-                    logger.debug(f"Non-text update received: {update}")
-                    response_payload = {"text": "Désolé, je ne prends en charge que les messages texte et les actions de menu pour le moment."}
+                    response_payload = {"text": f"Action '{callback_data}' non reconnue."}
 
-            except Exception as e:
-                logger.error(f"Error in _processor: {e}", exc_info=True)
-                response_payload = {"text": f"Erreur lors du traitement: {str(e)}"}
-
-            if response_payload:
-                if 'chat_id' not in response_payload:
-                    response_payload['chat_id'] = chat_id or self.chat_id
-                if 'text' not in response_payload:
-                    response_payload['text'] = ''
-                logger.debug(f"Sending response: {response_payload}")
-                self.send_message(response_payload)
-            self.incoming_queue.task_done()
+            else:
+                logger.debug("Non-text update received: %s", update)
+                response_payload = {"text": "Désolé, je ne prends en charge que les messages texte "
+                                            "et les actions de menu pour le moment."}
+
+            # Réponse paginée : seule la première page est produite maintenant
+            if isinstance(response_payload, (PageCursor, Iterator)):
+                response_payload = self._paginate(response_payload, chat_id)
+
+        except Exception as e:
+            logger.error(f"Error in _processor: {e}", exc_info=True)
+            response_payload = {"text": f"Erreur lors du traitement: {str(e)}"}
+
+        self._send_response(response_payload, chat_id, span)
+
+    def _send_response(self, response_payload: Optional[Dict], chat_id: Optional[str], span: Optional[Span]) -> None:
+        """Complète une réponse (chat, texte, trace) et la met en file d'envoi."""
+        if response_payload:
+            if 'chat_id' not in response_payload:
+                response_payload['chat_id'] = chat_id or self.chat_id
+            if 'text' not in response_payload:
+                response_payload['text'] = ''
+            if span is not None:
+                response_payload['_trace'] = span.trace_id
+            logger.debug("Sending response: %s", response_payload)
+            self.send_message(response_payload)
+
+    @staticmethod
+    def _prompt_answer_error(command_details: Dict, index: int, answer: str) -> Optional[str]:
+        """Valide la réponse à une question d'un prompt dès sa saisie.
+
+        Args:
+            command_details: Détails de la commande en cours
+            index: Position de la question
+            answer: Réponse de l'utilisateur
+
+        Returns:
+            Message d'erreur suivi de la question à reposer, ou None si la réponse est valide
+        """
+        try:
+            ArgumentSchema.from_details(command_details).validate_step(index, answer)
+        except ArgumentError as e:
+            return f"{e}\n{command_details['asks'][index]}"
+        return None
+
+    def _run_handler(self, handler: HandlerProtocol, cmd_enum: Union[Command, DynamicEnumMember],
+                     arguments: List, span: Optional[Span], chat_id: Optional[str] = None) -> Optional[Dict]:
+        """Appelle `process_command` du handler, sous le profileur s'il est actif pour cette commande,
+        en mesurant sa durée si la mise à jour est tracée.
+
+        Une commande déclarée avec `batch` est confiée au regroupement : la réponse
+        est envoyée plus tard au chat, et None est retourné."""
+        command_details = self.registry.get(cmd_enum.value)
+        if command_details and command_details.get("batch") and chat_id is not None:
+            return self._submit_batch(handler, cmd_enum, command_details, arguments, span, chat_id)
+        if command_details and command_details.get("action") is TelegramHandler.help:
+            # L'aide par défaut liste les menus de ce bot, tous handlers confondus
+            return format_help(self.registry)
+        if self.profiler.enabled and self.profiler.should_profile(cmd_enum.value):
+            call = functools.partial(self.profiler.run, cmd_enum.value, handler.process_command)
+        else:
+            call = handler.process_command
+        if span is None:
+            return call(cmd_enum, arguments)
+        started = time.perf_counter()
+        try:
+            return call(cmd_enum, arguments)
+        finally:
+            span.event("handler", command=cmd_enum.value, ms=round((time.perf_counter() - started) * 1000, 3))
+
+    def _submit_batch(self, handler: HandlerProtocol, cmd_enum: Union[Command, DynamicEnumMember],
+                      command_details: Dict,
+                      arguments: List, span: Optional[Span], chat_id: str) -> Optional[Dict]:
+        """Valide les arguments d'un appel et l'ajoute au lot de sa commande.
+
+        Returns:
+            Message d'erreur si les arguments sont invalides, None si l'appel est mis en attente
+        """
+        try:
+            kwargs = ArgumentSchema.from_details(command_details).parse(arguments)
+        except ArgumentError as e:
+            return {"text": str(e)}
+        batch_func = getattr(handler, command_details["batch"], None)
+        if batch_func is None:
+            logger.error(f"Batch method {command_details['batch']} not found in handler")
+            return {"text": f"Erreur: Action pour '{cmd_enum.value}' non trouvée."}
+        window = command_details.get("batch_window")
+        if span is not None:
+            self.tracer.hold(span)
+        self._batcher.submit((id(handler), cmd_enum.value), cmd_enum.value, batch_func,
+                             Config.BATCH_WINDOW if window is None else window, kwargs, chat_id, span)
+        return None
+
+    def _deliver_batch_response(self, chat_id: str, response_payload: Any, span: Optional[Span]) -> None:
+        """Envoie la réponse d'un appel servi par un lot.
+
+        La méthode de lot peut retourner le même objet pour plusieurs appels (même
+        symbole) : chaque réponse est copiée avant d'être adressée à son chat.
+        """
+        try:
+            if isinstance(response_payload, (PageCursor, Iterator)):
+                response_payload = self._paginate(response_payload, chat_id)
+            elif isinstance(response_payload, dict):
+                response_payload = dict(response_payload)
+            self._send_response(response_payload, chat_id, span)
+        except Exception as e:
+            logger.error(f"Error in batch response: {e}", exc_info=True)
+        finally:
+            if span is not None:
+                self.tracer.release(span)
+
+    def _paginate(self, rows: Union[PageCursor, Iterator], chat_id: Optional[str]) -> Dict:
+        """Enregistre une réponse paginée et retourne sa première page.
+
+        Args:
+            rows: Curseur ou itérateur de lignes retourné par un handler
+            chat_id: Chat destinataire, seul autorisé à consulter les pages suivantes
+
+        Returns:
+            Dict contenant la première page et ses boutons de navigation
+        """
+        cursor = rows if isinstance(rows, PageCursor) else PageCursor(rows)
+        owner = chat_id or self.chat_id
+        return self.cursors.render(self.cursors.add(cursor, owner), 0, owner)
 
     def send_message(self, payload: Union[Dict, List[Dict]]) -> None:
         """Envoie un ou plusieurs messages.
@@ -258,20 +764,95 @@ class TelegramBot:
             payload: Message ou liste de messages à envoyer
         """
         if isinstance(payload, dict):
-            self.outgoing_queue.put(payload)
+            self._enqueue_payload(payload)
         elif isinstance(payload, list):
             for item in payload:
                 if isinstance(item, dict):
-                    self.outgoing_queue.put(item)
+                    self._enqueue_payload(item)
                 else:
                     logger.warning(f"Ignored non-dict item in list: {item}")
         else:
             logger.warning(f"Ignored invalid payload type: {type(payload)}")
 
-    def stop(self) -> None:
-        """Arrête proprement le bot et tous ses threads."""
-        self.outgoing_queue.put(None)
+    def _enqueue_payload(self, payload: Dict) -> None:
+        """Transmet un message au thread d'envoi (propre ou partagé)."""
+        span = self.tracer.adopt(payload.get("_trace"))
+        if span is not None:
+            self.tracer.hold(span)
+        if self._runtime is not None:
+            self._runtime.submit_payload(self, payload)
+        elif self.outbox is not None:
+            if not self.outbox.put(payload):
+                self.metrics.increment("dead_letters")
+                if span is not None:
+                    self.tracer.release(span)
+        else:
+            self.outgoing_queue.put(payload)
+
+    def _cancel_long_poll(self) -> None:
+        """Interrompt le long polling en cours.
+
+        Telegram termine un `getUpdates` en attente (409 Conflict) dès qu'un autre
+        appel `getUpdates` arrive : un appel immédiat (`timeout=0`) libère donc le
+        thread de réception sans attendre la fin des 30 secondes. L'offset envoyé
+        confirme au passage les mises à jour déjà reçues.
+        """
+        params = {"timeout": 0, "limit": 1}
+        if self.last_update_id:
+            params["offset"] = self.last_update_id + 1
+        try:
+            self._session.get(f"{self.api_url}/getUpdates", params=params, timeout=Config.SEND_TIMEOUT)
+        except Exception as e:
+            logger.debug("Long poll cancellation failed: %s", e)
+
+    def _join_threads(self, prefix: str, deadline: Optional[float]) -> None:
+        """Attend la fin des threads dont le nom commence par `prefix`, au plus jusqu'à `deadline`."""
+        for thread in self._threads:
+            if thread.name.startswith(prefix) and thread.is_alive():
+                thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête proprement le bot et tous ses threads.
+
+        La réception est interrompue en premier ; les mises à jour déjà reçues sont
+        ensuite traitées et les lots en attente exécutés, puis les messages en attente
+        dans `outgoing_queue` (ou prêts dans l'outbox) sont envoyés avant l'arrêt du
+        thread d'envoi.
+
+        Args:
+            timeout: Durée maximale de l'arrêt en secondes (None = sans limite)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._stop_event.set()
+        if self._session is not None and any(t.name.startswith("receiver") and t.is_alive() for t in self._threads):
+            self._cancel_long_poll()
+        self._join_threads("receiver", deadline)
         self.incoming_queue.put(None)
-        if hasattr(self, '_session'):
+        self._join_threads("processor", deadline)
+        self._batcher.close()
+        self._drain_event.set()
+        if self.outbox is not None:
+            self.outbox.wake()
+        self.outgoing_queue.put(None)
+        self._join_threads("sender", deadline)
+        # La session d'un runtime partagé est fermée par le runtime lui-même
+        if self._session is not None and self._runtime is None:
             self._session.close()
-        logger.info("Signal d'arrêt envoyé aux threads.")
+        alive = [t.name for t in self._threads if t.is_alive()]
+        if alive:
+            logger.warning(f"Arrêt incomplet après {timeout}s, threads actifs: {alive}, "
+                           f"{self.outgoing_queue.qsize()} message(s) non envoyé(s)")
+        else:
+            # Le bot peut être redémarré ; `start()` ouvre alors une nouvelle session
+            self._threads = []
+            if self._runtime is None:
+                self._session = None
+            logger.info("Bot arrêté.")
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Attend la fin des threads du bot (après un `stop()` depuis un autre thread).
+
+        Args:
+            timeout: Durée maximale d'attente en secondes (None = sans limite)
+        """
+        self._join_threads("", None if timeout is None else time.monotonic() + timeout)
@@ -3,7 +3,7 @@
 from venantvr.telegram.classes.command import Command
 from venantvr.telegram.classes.enums import DynamicEnum, DynamicEnumMember
 from venantvr.telegram.classes.menu import Menu
-from venantvr.telegram.classes.types import Action, ArgumentType, BoolGuard, CurrentPrompt
+from venantvr.telegram.classes.types import Action, ArgumentType, BoolGuard, CurrentPrompt, PromptState
 
 __all__ = [
     "Command",
@@ -14,4 +14,5 @@ __all__ = [
     "ArgumentType",
     "BoolGuard",
     "CurrentPrompt",
+    "PromptState",
 ]
@@ -4,7 +4,7 @@ from venantvr.telegram.classes.enums import DynamicEnum
 class Command(DynamicEnum):
     """
     Enum dynamique pour les commandes. Les membres sont injectés au démarrage
-    via la méthode `Command.register({...})`.
+    via `Command.register({...})` ou `Command.define(...)`, appelée par `@command`.
     """
     # Les membres comme HELP, BONJOUR, etc. seront ajoutés dynamiquement.
     pass
@@ -1,12 +1,16 @@
-from typing import Optional, Type
+import sys
+from typing import Dict, List, Optional, Type
 
 
 class DynamicEnumMember:
     """Représente un membre d'un enum dynamique (ex: Command.HELP)."""
 
+    __slots__ = ("name", "value", "parent_enum")
+
     def __init__(self, name: str, value: str, parent_enum: Type['DynamicEnum']):
         self.name = name
-        self.value = value
+        # Valeur partagée par le registre, les prompts et les callbacks de menu
+        self.value = sys.intern(value)
         self.parent_enum = parent_enum
 
     def __repr__(self) -> str:
@@ -26,34 +30,51 @@ class DynamicEnumMember:
 
 
 class DynamicEnum:
-    """Classe de base pour créer des enums dont les membres sont injectés."""
-    _members: dict[str, DynamicEnumMember] = {}
-    _value_map: dict[str, DynamicEnumMember] = {}
+    """Classe de base pour créer des enums dont les membres sont injectés.
+
+    Chaque sous-classe a ses propres tables de membres : `Command` et `Menu` ne
+    partagent rien. Les membres sont créés explicitement (`register`, `define`) ;
+    `from_value` ne fait que chercher et ne crée jamais de membre.
+    """
+    _members: Dict[str, DynamicEnumMember] = {}
+    _value_map: Dict[str, DynamicEnumMember] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._members = {}
+        cls._value_map = {}
 
     @classmethod
-    def register(cls, items: dict[str, str]):
-        """Injecte les membres dans la classe enum."""
-        if not cls._members:  # Éviter la réinitialisation si déjà peuplé
-            for name, value in items.items():
-                member = DynamicEnumMember(name, value, parent_enum=cls)
-                cls._members[name] = member
-                setattr(cls, name, member)
-                cls._value_map[value] = member
+    def register(cls, items: Dict[str, str]) -> None:
+        """Injecte les membres dans la classe enum (les valeurs déjà connues sont conservées)."""
+        for name, value in items.items():
+            cls.define(value, name)
 
     @classmethod
-    def from_value(cls, value: str) -> Optional[DynamicEnumMember]:
-        """Retrouve un membre par sa valeur."""
-        if value in cls._value_map:
-            return cls._value_map[value]
-        # Créer dynamiquement si non existant (pour les handlers)
-        name = value.lstrip('/').upper()
-        member = DynamicEnumMember(name, value, parent_enum=cls)
-        cls._members[name] = member
-        setattr(cls, name, member)
-        cls._value_map[value] = member
+    def define(cls, value: str, name: Optional[str] = None) -> DynamicEnumMember:
+        """Retourne le membre d'une valeur, en le créant s'il n'existe pas.
+
+        Args:
+            value: Valeur du membre (ex: "/help")
+            name: Nom du membre (par défaut la valeur sans "/" en majuscules)
+
+        Returns:
+            Le membre
+        """
+        member = cls._value_map.get(value)
+        if member is None:
+            member = DynamicEnumMember(name or value.lstrip('/').upper(), value, parent_enum=cls)
+            cls._members[member.name] = member
+            setattr(cls, member.name, member)
+            cls._value_map[member.value] = member
         return member
 
     @classmethod
-    def get_all(cls) -> list[DynamicEnumMember]:
+    def from_value(cls, value: str) -> Optional[DynamicEnumMember]:
+        """Retrouve un membre par sa valeur, None si elle est inconnue."""
+        return cls._value_map.get(value)
+
+    @classmethod
+    def get_all(cls) -> List[DynamicEnumMember]:
         """Retourne tous les membres enregistrés."""
         return list(cls._members.values())
@@ -1,5 +1,4 @@
-from typing import Dict, Callable, Tuple, Union
-from typing import TypedDict
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict, Union
 
 from venantvr.telegram.classes.command import Command
 from venantvr.telegram.classes.enums import DynamicEnumMember
@@ -16,13 +15,32 @@ class Action(TypedDict):
 
 
 class CurrentPrompt:
-    def __init__(self, action: str, command: Union[Command, DynamicEnumMember], arguments: list, current_prompt_index: int = 0):
+    def __init__(self, action: str, command: Union[Command, DynamicEnumMember], arguments: list,
+                 current_prompt_index: int = 0):
         self.action = action
         self.command = command
         self.arguments = arguments
         self.current_prompt_index = current_prompt_index
 
 
+class PromptState:
+    """Questions en cours pour un chat : commande visée et réponses déjà reçues.
+
+    Lisible par clé (`state["arguments"]`) comme les dicts qu'il remplace.
+    """
+
+    __slots__ = ("command", "arguments")
+
+    def __init__(self, command: str, arguments: Optional[List[str]] = None):
+        self.command = command
+        self.arguments = arguments if arguments is not None else []
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
 class BoolGuard:
     def __init__(self, initial_value):
         self.__value = initial_value
@@ -0,0 +1,190 @@
+"""Répartition du traitement d'un bot sur plusieurs processus, par chat."""
+
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.config import Config
+from venantvr.telegram.decorators import build_registry
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkerSink:
+    """Runtime d'un processus de traitement : les réponses repartent vers l'ingestion."""
+
+    session = None
+
+    def __init__(self, results: Any) -> None:
+        self._results = results
+
+    def attach(self, bot: TelegramBot) -> None:
+        """Aucun thread : le processus de traitement ne reçoit ni n'envoie rien lui-même."""
+
+    @staticmethod
+    def submit_update(bot: TelegramBot, update: Dict) -> None:
+        bot._process_update(update)
+
+    @staticmethod
+    def backlog(bot: TelegramBot) -> int:
+        return 0
+
+    def submit_payload(self, bot: TelegramBot, payload: Dict) -> None:
+        self._results.put(payload)
+        # La suite de la trace (envoi) est enregistrée par le processus d'ingestion
+        span = bot.tracer.adopt(payload.get("_trace"))
+        if span is not None:
+            span.event("handoff")
+            bot.tracer.release(span)
+
+
+def _worker_main(bot_token: str, chat_id: str, handler_classes: List[Type], updates: Any, results: Any,
+                 admin_chat_ids: Optional[List[str]] = None) -> None:
+    """Boucle d'un processus de traitement.
+
+    Le processus instancie ses propres handlers et conserve l'état des
+    conversations (prompts, pagination) des chats qui lui sont attribués.
+    """
+    bot = TelegramBot(bot_token, chat_id, [handler_class() for handler_class in handler_classes],
+                      runtime=_WorkerSink(results), admin_chat_ids=admin_chat_ids)
+    while True:
+        update = updates.get()
+        if update is None:
+            break
+        bot._process_update(update)
+    # Les lots en attente sont servis avant la fin du processus
+    bot._batcher.close()
+
+
+class ProcessCluster:
+    """Un processus d'ingestion et N processus de traitement, répartis par chat.
+
+    Le processus courant reçoit les mises à jour (long polling, ou `feed_update`
+    depuis un webhook) et les distribue aux processus de traitement selon
+    `chat_id % workers` : un chat est toujours servi par le même processus, qui
+    détient donc seul l'état de ses conversations. Les réponses reviennent par
+    une file commune vers un unique thread d'envoi, soumis à la limite de débit
+    du bot. Les handlers sont passés sous forme de classes, instanciées dans
+    chaque processus de traitement.
+
+    Les lots (`batch=`) et le profilage (`/profile`) sont propres à chaque
+    processus : un lot ne regroupe que les appels des chats de ce processus, et
+    `/profile` ne profile que le processus qui sert le chat administrateur.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str, handler_classes: List[Type],
+                 workers: int = Config.CLUSTER_WORKERS, start_method: str = Config.CLUSTER_START_METHOD,
+                 admin_chat_ids: Optional[List[str]] = None) -> None:
+        """Prépare le cluster sans démarrer de processus.
+
+        Args:
+            bot_token: Token d'authentification du bot
+            chat_id: ID du chat par défaut
+            handler_classes: Classes des handlers, importables depuis les processus fils
+            workers: Nombre de processus de traitement
+            start_method: Méthode de démarrage multiprocessing ("spawn", "fork", "forkserver")
+            admin_chat_ids: Chats autorisés à utiliser les commandes d'administration (`/profile`)
+        """
+        context = multiprocessing.get_context(start_method)
+        self._updates = [context.Queue() for _ in range(workers)]
+        self._results = context.Queue()
+        self._processes = [
+            context.Process(target=_worker_main,
+                            args=(bot_token, chat_id, handler_classes, updates, self._results, admin_chat_ids),
+                            daemon=True, name=f"worker-{i}")
+            for i, updates in enumerate(self._updates)
+        ]
+        self._poll = True
+        self._sender_thread = threading.Thread(target=self._sender, daemon=True, name="cluster-sender")
+        self.session: Any = None
+        self.bot = TelegramBot(bot_token, chat_id, runtime=self, admin_chat_ids=admin_chat_ids)
+        # Registre utilisé à l'ingestion (debounce) ; les handlers vivent dans les processus fils
+        self.bot.registry.update(build_registry(handler_classes))
+
+    def attach(self, bot: TelegramBot) -> None:
+        """Démarre le thread de long polling du bot d'ingestion, sauf en mode webhook."""
+        if self._poll:
+            thread = threading.Thread(target=bot._receiver, daemon=True, name=f"receiver-{bot.name}")
+            bot._threads.append(thread)
+            thread.start()
+
+    def start(self, poll: bool = True) -> None:
+        """Démarre les processus de traitement, le thread d'envoi et le bot d'ingestion.
+
+        Args:
+            poll: Démarre aussi le long polling ; False si les mises à jour arrivent par `feed_update`
+        """
+        if self.session is None:
+            self.session = TelegramBot._create_session()
+        for process in self._processes:
+            process.start()
+        self._sender_thread.start()
+        self._poll = poll
+        self.bot.start()
+        logger.info(f"Cluster démarré: {len(self._processes)} processus de traitement")
+
+    def _shard_for(self, update: Dict) -> Any:
+        """Retourne la file du processus responsable du chat de la mise à jour."""
+        message = update.get("message") or update.get("callback_query", {}).get("message") or {}
+        try:
+            chat_id = int(message.get("chat", {}).get("id", 0))
+        except (TypeError, ValueError):
+            chat_id = 0
+        return self._updates[chat_id % len(self._updates)]
+
+    def feed_update(self, update: Dict) -> None:
+        """Injecte une mise à jour reçue hors long polling (webhook).
+
+        Args:
+            update: Mise à jour telle que transmise par l'API Telegram
+        """
+        update.setdefault("_received_at", time.time())
+        self.submit_update(self.bot, update)
+
+    def backlog(self, bot: TelegramBot) -> int:
+        """Retourne le nombre de mises à jour en attente dans les processus de traitement."""
+        try:
+            return sum(updates.qsize() for updates in self._updates)
+        except NotImplementedError:
+            # multiprocessing.Queue.qsize n'est pas disponible sur macOS
+            return 0
+
+    def submit_update(self, bot: TelegramBot, update: Dict) -> None:
+        """Transmet une mise à jour au processus responsable de son chat."""
+        self._shard_for(update).put(update)
+
+    def submit_payload(self, bot: TelegramBot, payload: Dict) -> None:
+        """Met en file un message pour l'unique thread d'envoi."""
+        self._results.put(payload)
+
+    def _sender(self) -> None:
+        """Thread d'envoi : collecte les réponses de tous les processus."""
+        while True:
+            payload = self._results.get()
+            if payload is None:
+                break
+            self.bot._deliver(payload)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête la réception, les processus de traitement puis le thread d'envoi.
+
+        Les mises à jour déjà distribuées sont traitées et les réponses produites
+        sont envoyées avant l'arrêt.
+
+        Args:
+            timeout: Délai maximal d'attente de chaque étape, en secondes
+        """
+        self.bot.stop(timeout)
+        for updates in self._updates:
+            updates.put(None)
+        for process in self._processes:
+            process.join(timeout)
+        self._results.put(None)
+        if self._sender_thread.is_alive():
+            self._sender_thread.join(timeout)
+        if self.session is not None:
+            self.session.close()
+        logger.info("Cluster arrêté.")
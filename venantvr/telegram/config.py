@@ -2,12 +2,12 @@
 
 import logging
 import os
-from typing import Optional
+from typing import List, Optional
 
 
 def setup_logging(level: Optional[str] = None) -> None:
     """Configure le système de logging pour l'application.
-    
+
     Args:
         level: Niveau de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
@@ -31,6 +31,7 @@ class Config:
     API_TIMEOUT: int = 35
     SEND_TIMEOUT: int = 10
     POLL_TIMEOUT: int = 30
+    STOP_TIMEOUT: float = 15.0
 
     # Retry settings
     MAX_RETRIES: int = 3
@@ -39,6 +40,65 @@ class Config:
     # Queue settings
     MAX_QUEUE_SIZE: int = 1000
 
+    # Débit d'envoi par bot (limite Telegram : ~30 messages/s)
+    SEND_RATE_LIMIT: float = 30.0
+    SEND_BURST: int = 30
+
+    # Runtime multi-bots
+    HTTP_POOL_SIZE: int = 10
+    RUNTIME_PROCESSOR_WORKERS: int = 4
+    RUNTIME_SENDER_WORKERS: int = 2
+
+    # Répartition multi-processus
+    CLUSTER_WORKERS: int = 4
+    CLUSTER_START_METHOD: str = "spawn"
+
     # Validation
     MAX_MESSAGE_LENGTH: int = 4096
     MAX_CALLBACK_DATA_LENGTH: int = 64
+
+    # Debounce des callback_query (secondes)
+    DEBOUNCE_WINDOW: float = 1.0
+    DEBOUNCE_MAX_ENTRIES: int = 10000
+
+    # Délestage des mises à jour périmées (secondes)
+    MAX_UPDATE_AGE: float = 120.0
+    BACKLOG_REPORT_INTERVAL: float = 10.0
+
+    # Pagination des réponses volumineuses
+    PAGE_SIZE: int = 20
+    PAGINATION_TTL: float = 600.0
+    PAGINATION_MAX_CURSORS: int = 256
+
+    # Traçage échantillonné (0 = désactivé)
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_BUFFER_SIZE: int = 1000
+    TRACE_MAX_ACTIVE: int = 1000
+
+    # Profilage à la demande
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_INTERVAL: float = 0.005
+
+    # Outbox persistante (écritures groupées, tentatives d'envoi, délai de base en secondes)
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BACKOFF: float = 2.0
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    # Attente maximale d'un message en mémoire avant son écriture groupée (secondes)
+    OUTBOX_COMMIT_INTERVAL: float = 0.1
+
+    # Regroupement des appels d'une commande (fenêtre en secondes, taille maximale d'un lot)
+    BATCH_WINDOW: float = 0.2
+    BATCH_MAX_SIZE: int = 100
+
+    # Long polling adaptatif : lot réduit proportionnellement à la file de traitement (sans
+    # descendre sous POLL_MIN_LIMIT), pause au-delà de POLL_PAUSE_BACKLOG mises à jour en
+    # attente, attente exponentielle après erreur (secondes)
+    POLL_MAX_LIMIT: int = 100
+    POLL_MIN_LIMIT: int = 10
+    POLL_PAUSE_BACKLOG: int = MAX_QUEUE_SIZE
+    POLL_PAUSE: float = 0.5
+    POLL_BACKOFF_BASE: float = 0.5
+    POLL_BACKOFF_MAX: float = 60.0
+    # Types de mises à jour demandés à getUpdates (None = déduits des commandes du bot)
+    POLL_ALLOWED_UPDATES: Optional[List[str]] = None
@@ -0,0 +1,100 @@
+"""Pré-traitement des lots de mises à jour : suppression des callbacks dupliqués."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from venantvr.telegram.config import Config
+
+if TYPE_CHECKING:
+    from venantvr.telegram.decorators import CommandSpec
+
+logger = logging.getLogger(__name__)
+
+DebounceKey = Tuple[str, Optional[int], Optional[str]]
+
+
+class UpdateDebouncer:
+    """Écarte les callback_query répétés (même chat, même message, même data).
+
+    Un double appui sur un bouton inline produit deux callback_query identiques,
+    souvent dans le même lot `getUpdates`. Seul le premier est conservé tant que
+    la fenêtre de la commande n'est pas écoulée. La fenêtre se règle par commande
+    via `@command(debounce=...)` : `None` utilise `Config.DEBOUNCE_WINDOW`, `0`
+    désactive le filtre, `float("inf")` écarte tout nouvel appui sur le même bouton.
+
+    Les clés à fenêtre infinie ne sont jamais évincées par `max_entries`, mais
+    restent en mémoire : elles ne survivent pas à un redémarrage. Une action qui
+    ne doit s'exécuter qu'une fois doit donc rester idempotente côté handler.
+    """
+
+    def __init__(self, registry: Dict[str, "CommandSpec"], default_window: float = Config.DEBOUNCE_WINDOW,
+                 max_entries: int = Config.DEBOUNCE_MAX_ENTRIES) -> None:
+        """Initialise le filtre.
+
+        Args:
+            registry: Registre des commandes, consulté pour la fenêtre propre à chaque commande
+            default_window: Fenêtre par défaut en secondes
+            max_entries: Nombre maximal de clés mémorisées
+        """
+        self._registry = registry
+        self._default_window = default_window
+        self._max_entries = max_entries
+        self._expires: OrderedDict[DebounceKey, float] = OrderedDict()
+        # Boutons à fenêtre infinie déjà utilisés, hors de la limite `max_entries`
+        self._used: Set[DebounceKey] = set()
+
+    def _window_for(self, data: Optional[str]) -> float:
+        """Retourne la fenêtre de debounce applicable à une donnée de callback."""
+        details = self._registry.get(data) if data is not None else None
+        window = details.get("debounce") if details else None
+        return self._default_window if window is None else window
+
+    def filter(self, updates: List[dict]) -> List[dict]:
+        """Retourne le lot sans les callback_query dupliqués.
+
+        Args:
+            updates: Lot de mises à jour tel que renvoyé par `getUpdates`
+
+        Returns:
+            Liste des mises à jour à traiter, dans l'ordre d'origine
+        """
+        now = time.monotonic()
+        self._purge(now)
+        kept = []
+        for update in updates:
+            callback_query = update.get("callback_query")
+            if not callback_query:
+                kept.append(update)
+                continue
+            data = callback_query.get("data")
+            window = self._window_for(data)
+            if window <= 0:
+                kept.append(update)
+                continue
+            message = callback_query.get("message") or {}
+            key = (str(message.get("chat", {}).get("id")), message.get("message_id"), data)
+            if window == float("inf"):
+                if key in self._used:
+                    logger.debug("Bouton déjà utilisé ignoré: %s (update %s)", key, update.get("update_id"))
+                    continue
+                self._used.add(key)
+                kept.append(update)
+                continue
+            expires_at = self._expires.get(key)
+            self._expires[key] = now + window
+            self._expires.move_to_end(key)
+            if expires_at is not None and expires_at > now:
+                logger.debug("Callback dupliqué ignoré: %s (update %s)", key, update.get("update_id"))
+                continue
+            kept.append(update)
+        while len(self._expires) > self._max_entries:
+            self._expires.popitem(last=False)
+        return kept
+
+    def _purge(self, now: float) -> None:
+        """Supprime les clés dont la fenêtre est écoulée."""
+        expired = [key for key, expires_at in self._expires.items() if expires_at <= now]
+        for key in expired:
+            del self._expires[key]
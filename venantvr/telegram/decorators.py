@@ -1,35 +1,141 @@
+import functools
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+from venantvr.telegram.arguments import ArgumentSchema
 from venantvr.telegram.classes.command import Command
 from venantvr.telegram.classes.menu import Menu
 
 logger = logging.getLogger(__name__)
 
-COMMAND_REGISTRY: Dict[str, dict] = {}
+
+class CommandSpec:
+    """Détails immuables d'une commande enregistrée par `@command`.
+
+    Les champs se lisent comme attributs (`spec.asks`) ou, comme les anciens
+    dicts du registre, par clé (`spec["asks"]`, `spec.get("menu")`).
+    """
+
+    __slots__ = (
+        "name", "action", "enum", "arg_names", "asks", "kwargs_types", "schema", "menu", "description",
+        # Fenêtre anti-doublon des callbacks : None = Config.DEBOUNCE_WINDOW, 0 = désactivé
+        "debounce",
+        # Âge maximal d'une demande avant délestage : None = Config.MAX_UPDATE_AGE, 0 = jamais périmée
+        "max_age",
+        # Méthode du handler servant en un appel les demandes regroupées : None = appel direct
+        "batch",
+        # Durée de regroupement : None = Config.BATCH_WINDOW
+        "batch_window",
+    )
+
+    def __init__(self, **fields: Any) -> None:
+        unknown = set(fields) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"Champs de commande inconnus: {sorted(unknown)}")
+        for field in self.__slots__:
+            object.__setattr__(self, field, fields.get(field))
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retourne un champ, ou `default` si le champ n'existe pas."""
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __repr__(self) -> str:
+        return f"<CommandSpec {self.name}>"
+
+
+COMMAND_REGISTRY: Dict[str, CommandSpec] = {}
 
 
 def command(name: str, description: str = "", asks: Optional[List[str]] = None,
             kwargs_types: Optional[Dict[str, Callable]] = None,
-            menu: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+            menu: Optional[str] = None,
+            debounce: Optional[float] = None,
+            max_age: Optional[float] = None,
+            batch: Optional[str] = None,
+            batch_window: Optional[float] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        command_enum = Command.from_value(name)
+        command_enum = Command.define(name)
 
         # Obtenir les noms d'arguments de la fonction de manière plus robuste
         sig = inspect.signature(func)
-        arg_names = [param.name for param in sig.parameters.values() if param.name != 'self']
-
-        COMMAND_REGISTRY[name] = {
-            "action": func,
-            "enum": command_enum,
-            "arg_names": arg_names,
-            "asks": asks or [],
-            "kwargs_types": kwargs_types or {},
-            "menu": Menu.from_value(menu) if menu else None,
-            "description": description  # Stocker la description
-        }
-        logger.debug(f"Registered command: {name}")
+        arg_names = tuple(param.name for param in sig.parameters.values() if param.name != 'self')
+
+        details = CommandSpec(
+            name=command_enum.value,
+            action=func,
+            enum=command_enum,
+            arg_names=arg_names,
+            asks=tuple(asks or ()),
+            kwargs_types=kwargs_types or {},
+            # Conversions et valeurs par défaut résolues une fois pour toutes
+            schema=ArgumentSchema.compile(command_enum.value, func, kwargs_types),
+            menu=Menu.define(menu) if menu else None,
+            description=description,
+            debounce=debounce,
+            max_age=max_age,
+            batch=batch,
+            batch_window=batch_window
+        )
+        COMMAND_REGISTRY[details.name] = details
+        # Conservé sur la fonction pour construire des registres propres à chaque bot
+        func.__telegram_command__ = details  # type: ignore[attr-defined]
+        logger.debug("Registered command: %s", name)
         return func
 
     return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def handler_commands(handler_class: type) -> Dict[str, CommandSpec]:
+    """Retourne les commandes déclarées par une classe de handler et ses parents.
+
+    Contrairement à `COMMAND_REGISTRY`, où la dernière déclaration d'un nom
+    l'emporte pour tout le processus, la résolution suit ici le MRO de la classe :
+    une commande redéfinie dans une sous-classe masque celle du parent.
+
+    Args:
+        handler_class: Classe du handler
+
+    Returns:
+        Dict des détails de commande, indexé par nom de commande
+    """
+    commands: Dict[str, CommandSpec] = {}
+    for klass in handler_class.__mro__:
+        for attr in vars(klass).values():
+            details = getattr(getattr(attr, "__func__", attr), "__telegram_command__", None)
+            if details is not None and details["name"] not in commands:
+                commands[details["name"]] = details
+    return commands
+
+
+def build_registry(handlers: Iterable[Any]) -> Dict[str, CommandSpec]:
+    """Construit le registre des commandes servies par un ensemble de handlers.
+
+    Chaque bot dispose ainsi de ses propres commandes et menus, sans hériter de
+    celles déclarées par les handlers d'autres bots du même processus. En cas de
+    doublon, le premier handler qui déclare la commande l'emporte.
+
+    Args:
+        handlers: Handlers du bot, instances ou classes
+
+    Returns:
+        Dict des détails de commande, indexé par nom de commande
+    """
+    registry: Dict[str, CommandSpec] = {}
+    for handler in handlers:
+        handler_class = handler if isinstance(handler, type) else type(handler)
+        for name, details in handler_commands(handler_class).items():
+            registry.setdefault(name, details)
+    return registry
@@ -0,0 +1,52 @@
+"""Compteurs et jauges de fonctionnement du bot."""
+
+import threading
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+
+class BotMetrics:
+    """Métriques d'un bot, partagées entre ses threads.
+
+    Les compteurs s'incrémentent (`stale_dropped`, ...), les jauges reflètent
+    la dernière valeur observée (`queue_age`, `incoming_backlog`, ...).
+    """
+
+    def __init__(self) -> None:
+        """Initialise des métriques vides."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Number] = {}
+        self._gauges: Dict[str, Number] = {}
+
+    def increment(self, name: str, value: Number = 1) -> None:
+        """Incrémente un compteur.
+
+        Args:
+            name: Nom du compteur
+            value: Valeur à ajouter
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: Number) -> None:
+        """Met à jour une jauge.
+
+        Args:
+            name: Nom de la jauge
+            value: Nouvelle valeur
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str, default: Number = 0) -> Number:
+        """Retourne la valeur d'un compteur ou d'une jauge."""
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            return self._gauges.get(name, default)
+
+    def snapshot(self) -> Dict[str, Number]:
+        """Retourne une copie de toutes les métriques."""
+        with self._lock:
+            return {**self._counters, **self._gauges}
@@ -0,0 +1,235 @@
+"""File d'envoi persistante, pour que les messages survivent aux redémarrages."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from venantvr.telegram.config import Config
+
+logger = logging.getLogger(__name__)
+
+OutboxItem = Tuple[int, Dict[str, Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+class SqliteOutbox:
+    """Outbox SQLite avec écritures groupées.
+
+    Les messages mis en file sont accumulés en mémoire puis écrits par lots,
+    en une transaction : à chaque fois que le thread d'envoi cherche un message,
+    dès que `batch_size` messages attendent, ou dès qu'un message attend depuis
+    plus de `commit_interval` secondes. Les accusés de réception (réponse
+    2xx) sont groupés de la même façon ; un message envoyé puis perdu avant
+    l'écriture de son accusé est renvoyé au redémarrage (livraison au moins une fois).
+
+    Un échec est retenté avec un délai exponentiel, jusqu'à `max_attempts`
+    tentatives ; le message est alors déplacé dans la table `dead_letters`, comme
+    immédiatement en cas d'erreur définitive (4xx hors 429).
+    """
+
+    def __init__(self, path: str, batch_size: int = Config.OUTBOX_BATCH_SIZE,
+                 max_attempts: int = Config.OUTBOX_MAX_ATTEMPTS, retry_backoff: float = Config.OUTBOX_RETRY_BACKOFF,
+                 commit_interval: float = Config.OUTBOX_COMMIT_INTERVAL) -> None:
+        """Ouvre (ou crée) l'outbox.
+
+        Args:
+            path: Chemin du fichier SQLite
+            batch_size: Nombre de messages en attente déclenchant une écriture groupée
+            max_attempts: Nombre maximal de tentatives d'envoi d'un message
+            retry_backoff: Délai de base entre deux tentatives, doublé à chaque échec (secondes)
+            commit_interval: Attente maximale d'un message en mémoire avant son écriture (secondes)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.commit_interval = commit_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[str, float]] = []
+        self._acked: List[int] = []
+        self._ready: Deque[OutboxItem] = deque()
+        self._in_flight: Set[int] = set()
+
+    def put(self, payload: Dict[str, Any]) -> bool:
+        """Met un message en file.
+
+        Un message non sérialisable en JSON part directement en dead letter. Si
+        l'écriture groupée échoue, les messages restent en mémoire et l'écriture
+        est retentée au lot suivant.
+
+        Args:
+            payload: Message à envoyer, sérialisable en JSON
+
+        Returns:
+            True si le message est en file, False s'il a été écarté
+        """
+        try:
+            serialized = json.dumps(payload, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            return self._reject(payload, f"message non sérialisable: {e}")
+        with self._cond:
+            now = time.time()
+            self._pending.append((serialized, now))
+            if len(self._pending) >= self.batch_size or now - self._pending[0][1] >= self.commit_interval:
+                try:
+                    self._flush_locked()
+                except sqlite3.Error as e:
+                    logger.error(f"Écriture de l'outbox impossible ({len(self._pending)} message(s) en mémoire): {e}")
+            self._cond.notify()
+        return True
+
+    def _reject(self, payload: Dict[str, Any], error: str) -> bool:
+        """Enregistre en dead letter un message qui ne peut pas entrer dans l'outbox.
+
+        Returns:
+            False, le message n'étant pas mis en file
+        """
+        logger.error(f"Message écarté de l'outbox: {error}")
+        try:
+            with self._cond, self._conn:
+                self._conn.execute("BEGIN")
+                # L'identifiant est pris dans la séquence de l'outbox pour rester unique
+                serialized = json.dumps(payload, ensure_ascii=False, default=repr)
+                row_id = self._conn.execute("INSERT INTO outbox (payload, attempts, created_at) VALUES (?, 0, ?)",
+                                            (serialized, time.time())).lastrowid
+                self._conn.execute("INSERT INTO dead_letters "
+                                   "SELECT id, payload, attempts, ?, ? FROM outbox WHERE id = ?",
+                                   (error, time.time(), row_id))
+                self._conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+        except sqlite3.Error as e:
+            logger.error(f"Dead letter impossible, message perdu: {e}")
+        return False
+
+    def flush(self) -> None:
+        """Écrit sur disque les messages et accusés en attente."""
+        with self._cond:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Écrit les messages et accusés en attente en une seule transaction."""
+        if not self._pending and not self._acked:
+            return
+        with self._conn:
+            self._conn.execute("BEGIN")
+            if self._pending:
+                self._conn.executemany("INSERT INTO outbox (payload, created_at) VALUES (?, ?)", self._pending)
+            if self._acked:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in self._acked])
+        self._in_flight.difference_update(self._acked)
+        self._pending.clear()
+        self._acked.clear()
+
+    def _claim_locked(self) -> None:
+        """Charge les prochains messages prêts à être envoyés."""
+        rows = self._conn.execute(
+            "SELECT id, payload FROM outbox WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+            (time.time(), self.batch_size + len(self._in_flight))
+        ).fetchall()
+        for row_id, payload in rows:
+            if row_id not in self._in_flight:
+                self._in_flight.add(row_id)
+                self._ready.append((row_id, json.loads(payload)))
+
+    def get(self, timeout: float) -> Optional[OutboxItem]:
+        """Retourne le prochain message à envoyer.
+
+        Args:
+            timeout: Durée maximale d'attente en secondes
+
+        Returns:
+            Tuple (identifiant, message), ou None si rien n'est prêt dans le délai
+            ou si l'attente a été interrompue par `wake`
+        """
+        with self._cond:
+            for attempt in range(2):
+                # Écrit les nouveaux messages même si des messages déjà chargés attendent leur envoi
+                self._flush_locked()
+                if not self._ready:
+                    self._claim_locked()
+                if self._ready:
+                    return self._ready.popleft()
+                if attempt == 0:
+                    self._cond.wait(timeout)
+            return None
+
+    def wake(self) -> None:
+        """Réveille le thread en attente dans `get` (arrêt du bot)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def ack(self, row_id: int) -> None:
+        """Marque un message comme envoyé ; l'effacement est écrit avec le prochain lot."""
+        with self._cond:
+            self._acked.append(row_id)
+
+    def fail(self, row_id: int, error: str, permanent: bool = False) -> bool:
+        """Enregistre l'échec d'un envoi.
+
+        Args:
+            row_id: Identifiant du message
+            error: Description de l'erreur
+            permanent: True si l'erreur ne peut pas se résoudre en réessayant
+
+        Returns:
+            True si le message sera retenté, False s'il part en dead letter
+        """
+        with self._cond:
+            self._in_flight.discard(row_id)
+            with self._conn:
+                self._conn.execute("BEGIN")
+                row = self._conn.execute("SELECT payload, attempts FROM outbox WHERE id = ?", (row_id,)).fetchone()
+                if row is None:
+                    return False
+                attempts = row[1] + 1
+                if permanent or attempts >= self.max_attempts:
+                    self._conn.execute("INSERT OR REPLACE INTO dead_letters VALUES (?, ?, ?, ?, ?)",
+                                       (row_id, row[0], attempts, error, time.time()))
+                    self._conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+                    logger.error(f"Message {row_id} abandonné après {attempts} tentative(s): {error}")
+                    return False
+                self._conn.execute("UPDATE outbox SET attempts = ?, next_attempt_at = ? WHERE id = ?",
+                                   (attempts, time.time() + self.retry_backoff * 2 ** (attempts - 1), row_id))
+                return True
+
+    def pending_count(self) -> int:
+        """Retourne le nombre de messages non encore envoyés (en mémoire ou sur disque)."""
+        with self._cond:
+            self._flush_locked()
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Retourne les messages abandonnés, avec leur nombre de tentatives et la dernière erreur."""
+        with self._cond:
+            rows = self._conn.execute("SELECT id, payload, attempts, error, failed_at FROM dead_letters ORDER BY id")
+            return [{"id": row_id, "payload": json.loads(payload), "attempts": attempts, "error": error,
+                     "failed_at": failed_at} for row_id, payload, attempts, error, failed_at in rows]
+
+    def close(self) -> None:
+        """Écrit les données en attente et ferme la base."""
+        with self._cond:
+            self._flush_locked()
+            self._conn.close()
@@ -0,0 +1,213 @@
+"""Pagination paresseuse des réponses volumineuses."""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from venantvr.telegram.config import Config
+
+PAGE_CALLBACK_PREFIX = "pg:"
+
+
+class PageCursor:
+    """Découpe un itérable de lignes en pages produites à la demande.
+
+    Seules les pages déjà consultées sont conservées ; les lignes suivantes ne
+    sont lues dans l'itérateur qu'au moment où la page est demandée. Un handler
+    peut retourner directement un `PageCursor` (pour fixer un en-tête) ou tout
+    itérateur de lignes, que le bot enveloppe automatiquement.
+    """
+
+    def __init__(self, rows: Iterable[Any], header: str = "", page_size: int = Config.PAGE_SIZE,
+                 max_length: int = Config.MAX_MESSAGE_LENGTH) -> None:
+        """Initialise le curseur.
+
+        Args:
+            rows: Lignes à afficher, converties en texte
+            header: En-tête répété en haut de chaque page
+            page_size: Nombre maximal de lignes par page
+            max_length: Longueur maximale du texte d'une page
+        """
+        self._rows = iter(rows)
+        self._header = header
+        self._page_size = page_size
+        self._max_length = max_length
+        self._pages: List[str] = []
+        self._peeked: Optional[str] = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def _next_row(self) -> Optional[str]:
+        """Lit la ligne suivante, en tenant compte d'une ligne déjà lue par anticipation."""
+        if self._peeked is not None:
+            row, self._peeked = self._peeked, None
+            return row
+        if self._exhausted:
+            return None
+        try:
+            return str(next(self._rows))
+        except StopIteration:
+            self._exhausted = True
+            return None
+
+    def _produce_page(self) -> bool:
+        """Produit la page suivante ; retourne False si l'itérateur est épuisé."""
+        budget = self._max_length - len(self._header) - 1
+        lines: List[str] = []
+        size = 0
+        while len(lines) < self._page_size:
+            row = self._next_row()
+            if row is None:
+                break
+            if len(row) > budget:
+                row = row[:max(budget - 1, 0)] + "…"
+            if lines and size + len(row) + 1 > budget:
+                self._peeked = row
+                break
+            lines.append(row)
+            size += len(row) + 1
+        if not lines:
+            return False
+        body = "\n".join(lines)
+        self._pages.append(f"{self._header}\n{body}" if self._header else body)
+        return True
+
+    def page(self, index: int) -> Optional[str]:
+        """Retourne le texte d'une page, en la produisant si nécessaire.
+
+        Args:
+            index: Numéro de page (à partir de 0)
+
+        Returns:
+            Le texte de la page, ou None si elle n'existe pas
+        """
+        if index < 0:
+            return None
+        with self._lock:
+            while len(self._pages) <= index:
+                if not self._produce_page():
+                    return None
+            return self._pages[index]
+
+    def has_page(self, index: int) -> bool:
+        """Indique si une page existe, en ne lisant au plus qu'une ligne d'avance."""
+        if index < 0:
+            return False
+        with self._lock:
+            if index < len(self._pages):
+                return True
+            if index > len(self._pages):
+                return False
+            if self._peeked is None:
+                self._peeked = self._next_row()
+            return self._peeked is not None
+
+
+class CursorStore:
+    """Stockage borné et expirant des curseurs de pagination.
+
+    Les curseurs les moins récemment consultés sont évincés au-delà de
+    `max_entries` ; ceux inutilisés depuis `ttl` secondes expirent.
+
+    Les `callback_data` pouvant être forgés par un client, un curseur est
+    identifié par un jeton aléatoire et n'est servi qu'au chat qui l'a créé.
+    """
+
+    def __init__(self, max_entries: int = Config.PAGINATION_MAX_CURSORS, ttl: float = Config.PAGINATION_TTL) -> None:
+        """Initialise un stockage vide.
+
+        Args:
+            max_entries: Nombre maximal de curseurs conservés
+            ttl: Durée de vie d'un curseur inutilisé, en secondes
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        # Identifiant -> (curseur, échéance, chat propriétaire)
+        self._cursors: OrderedDict[str, Tuple[PageCursor, float, Optional[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def add(self, cursor: PageCursor, chat_id: Optional[str] = None) -> str:
+        """Enregistre un curseur et retourne son identifiant.
+
+        Args:
+            cursor: Curseur à enregistrer
+            chat_id: Chat autorisé à consulter le curseur (None = tous)
+
+        Returns:
+            Identifiant aléatoire du curseur, court pour tenir dans `callback_data` (64 octets)
+        """
+        with self._lock:
+            self._purge(time.monotonic())
+            cursor_id = secrets.token_urlsafe(8)
+            while cursor_id in self._cursors:
+                cursor_id = secrets.token_urlsafe(8)
+            self._cursors[cursor_id] = (cursor, time.monotonic() + self._ttl, chat_id)
+            while len(self._cursors) > self._max_entries:
+                self._cursors.popitem(last=False)
+            return cursor_id
+
+    def get(self, cursor_id: str, chat_id: Optional[str] = None) -> Optional[PageCursor]:
+        """Retourne un curseur encore valide et prolonge sa durée de vie.
+
+        Args:
+            cursor_id: Identifiant du curseur
+            chat_id: Chat demandeur, comparé au propriétaire du curseur
+
+        Returns:
+            Le curseur, ou None s'il a expiré ou appartient à un autre chat
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            entry = self._cursors.get(cursor_id)
+            if entry is None or (entry[2] is not None and entry[2] != chat_id):
+                return None
+            self._cursors[cursor_id] = (entry[0], now + self._ttl, entry[2])
+            self._cursors.move_to_end(cursor_id)
+            return entry[0]
+
+    def _purge(self, now: float) -> None:
+        """Supprime les curseurs expirés."""
+        expired = [cursor_id for cursor_id, (_, expires_at, _) in self._cursors.items() if expires_at <= now]
+        for cursor_id in expired:
+            del self._cursors[cursor_id]
+
+    def render(self, cursor_id: str, index: int, chat_id: Optional[str] = None) -> Dict[str, Any]:
+        """Construit le message d'une page avec ses boutons de navigation.
+
+        Args:
+            cursor_id: Identifiant du curseur
+            index: Numéro de page (à partir de 0)
+            chat_id: Chat demandeur
+
+        Returns:
+            Dict contenant le texte et le markup du clavier
+        """
+        cursor = self.get(cursor_id, chat_id)
+        if cursor is None:
+            return {"text": "Cette liste a expiré, veuillez relancer la commande."}
+        text = cursor.page(index)
+        if text is None:
+            return {"text": "Aucun résultat." if index == 0 else "Page introuvable."}
+        buttons = []
+        if index > 0:
+            buttons.append({"text": "◀ Précédent", "callback_data": f"{PAGE_CALLBACK_PREFIX}{cursor_id}:{index - 1}"})
+        if cursor.has_page(index + 1):
+            buttons.append({"text": "Suivant ▶", "callback_data": f"{PAGE_CALLBACK_PREFIX}{cursor_id}:{index + 1}"})
+        payload: Dict[str, Any] = {"text": text}
+        if buttons:
+            payload["reply_markup"] = {"inline_keyboard": [buttons]}
+        return payload
+
+    def render_callback(self, callback_data: str, chat_id: Optional[str] = None) -> Dict[str, Any]:
+        """Construit la page désignée par les données d'un bouton de navigation, pour le chat demandeur."""
+        cursor_id, _, index = callback_data[len(PAGE_CALLBACK_PREFIX):].partition(":")
+        try:
+            return self.render(cursor_id, int(index), chat_id)
+        except ValueError:
+            return {"text": "Page introuvable."}
@@ -0,0 +1,234 @@
+"""Profilage à la demande des handlers."""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from venantvr.telegram.config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class HandlerProfiler:
+    """Profile les appels de `process_command`, activable à chaud.
+
+    Deux modes :
+    - `cprofile` : chaque appel retenu est profilé par cProfile et agrégé dans
+      un `pstats.Stats`, exportable au format `.pstats` ;
+    - `sample` : un thread échantillonne la pile des appels en cours toutes les
+      `interval` secondes ; le résultat s'exporte en piles repliées (`.folded`),
+      lisibles par flamegraph.pl ou speedscope.
+
+    Tant que `enabled` est faux, le bot n'appelle pas le profileur : le coût se
+    limite à la lecture de cet attribut.
+    """
+
+    def __init__(self, interval: float = Config.PROFILE_SAMPLE_INTERVAL) -> None:
+        """Initialise un profileur inactif.
+
+        Args:
+            interval: Période d'échantillonnage du mode `sample`, en secondes
+        """
+        self.enabled = False
+        self.mode = "cprofile"
+        self.sample_rate = 1.0
+        self.commands: Optional[FrozenSet[str]] = None
+        self.interval = interval
+        self.calls = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._stacks: Counter = Counter()
+        self._running: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+
+    def enable(self, commands: Optional[Iterable[str]] = None, sample_rate: float = 1.0,
+               mode: str = "cprofile") -> None:
+        """Active le profilage.
+
+        Args:
+            commands: Commandes à profiler (None = toutes)
+            sample_rate: Proportion des appels profilés, entre 0 et 1
+            mode: "cprofile" ou "sample"
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.commands = frozenset(commands) if commands else None
+        self.enabled = True
+        if mode == "sample" and (self._sampler is None or not self._sampler.is_alive()):
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True, name="profiler-sampler")
+            self._sampler.start()
+        logger.info(f"Profilage activé: mode={mode}, taux={sample_rate}, commandes={sorted(self.commands or [])}")
+
+    def disable(self) -> None:
+        """Désactive le profilage ; les résultats agrégés sont conservés."""
+        self.enabled = False
+        logger.info("Profilage désactivé.")
+
+    def reset(self) -> None:
+        """Efface les résultats agrégés."""
+        with self._lock:
+            self._stats = None
+            self._stacks.clear()
+            self.calls = 0
+
+    def should_profile(self, command: str) -> bool:
+        """Indique si un appel de la commande doit être profilé."""
+        if self.commands is not None and command not in self.commands:
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def run(self, command: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Exécute `func(*args)` sous le profileur.
+
+        Args:
+            command: Commande concernée, utilisée comme racine des piles échantillonnées
+            func: Fonction à exécuter
+            *args: Arguments de la fonction
+
+        Returns:
+            Le résultat de `func`
+        """
+        if self.mode == "sample":
+            ident = threading.get_ident()
+            self._running[ident] = command
+            try:
+                return func(*args)
+            finally:
+                self._running.pop(ident, None)
+                with self._lock:
+                    self.calls += 1
+        # Un seul profileur cProfile actif à la fois : les appels concurrents passent sans profilage
+        if not self._cprofile_lock.acquire(blocking=False):
+            return func(*args)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args)
+        finally:
+            self._cprofile_lock.release()
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+                self.calls += 1
+
+    def _sample_loop(self) -> None:
+        """Thread d'échantillonnage des piles des appels profilés."""
+        run_code = HandlerProfiler.run.__code__
+        while self.enabled and self.mode == "sample":
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            for ident, command in list(self._running.items()):
+                frame = frames.get(ident)
+                stack: List[str] = []
+                while frame is not None and frame.f_code is not run_code:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    stack.append(command)
+                    with self._lock:
+                        self._stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> List[str]:
+        """Retourne les piles échantillonnées au format replié (`pile compte`)."""
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in self._stacks.most_common()]
+
+    def summary(self, limit: int = 15) -> str:
+        """Retourne un résumé texte des fonctions les plus coûteuses."""
+        with self._lock:
+            if self.mode == "sample":
+                lines = [f"{count:>6} {stack.rsplit(';', 1)[-1]}" for stack, count in self._stacks.most_common(limit)]
+                return "\n".join(lines) or "Aucun échantillon."
+            if self._stats is None:
+                return "Aucun appel profilé."
+            stream = io.StringIO()
+            self._stats.stream = stream
+            try:
+                self._stats.sort_stats("cumulative").print_stats(limit)
+            finally:
+                self._stats.stream = sys.stdout
+            return stream.getvalue()
+
+    def dump(self, directory: str = Config.PROFILE_DIR, prefix: str = "profile") -> Optional[str]:
+        """Écrit les résultats agrégés dans un fichier `.pstats` ou `.folded`.
+
+        Args:
+            directory: Répertoire de destination
+            prefix: Préfixe du nom de fichier
+
+        Returns:
+            Chemin du fichier écrit, ou None s'il n'y a rien à écrire
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}")
+        if self.mode == "sample":
+            lines = self.collapsed()
+            if not lines:
+                return None
+            path = f"{base}.folded"
+            with open(path, "w", encoding="utf-8") as stream:
+                stream.writelines(f"{line}\n" for line in lines)
+            return path
+        with self._lock:
+            if self._stats is None:
+                return None
+            path = f"{base}.pstats"
+            self._stats.dump_stats(path)
+        return path
+
+    def command(self, arguments: List[str], dump_prefix: str = "profile") -> str:
+        """Interprète la commande d'administration `/profile`.
+
+        `/profile on [cprofile|sample] [taux] [/commande ...]`, `/profile off`,
+        `/profile status`, `/profile dump`, `/profile reset`.
+
+        Args:
+            arguments: Arguments de la commande
+            dump_prefix: Préfixe des fichiers écrits par `dump`
+
+        Returns:
+            Texte de la réponse
+        """
+        action = arguments[0] if arguments else "status"
+        if action == "on":
+            mode, rate, commands = "cprofile", 1.0, []
+            for argument in arguments[1:]:
+                if argument in PROFILE_MODES:
+                    mode = argument
+                elif argument.startswith("/"):
+                    commands.append(argument)
+                else:
+                    try:
+                        rate = float(argument)
+                    except ValueError:
+                        return f"Argument de profilage invalide: {argument}"
+            self.enable(commands, rate, mode)
+            return f"Profilage activé ({mode}, taux {rate}, commandes: {', '.join(commands) or 'toutes'})."
+        if action == "off":
+            self.disable()
+            return f"Profilage désactivé après {self.calls} appel(s) profilé(s)."
+        if action == "reset":
+            self.reset()
+            return "Résultats de profilage effacés."
+        if action == "dump":
+            path = self.dump(prefix=dump_prefix)
+            return f"Profil écrit dans {path}" if path else "Aucun résultat de profilage à écrire."
+        if action == "status":
+            state = "actif" if self.enabled else "inactif"
+            return f"Profilage {state} ({self.mode}), {self.calls} appel(s) profilé(s).\n{self.summary()}"
+        return "Usage: /profile on [cprofile|sample] [taux] [/commande ...] | off | status | dump | reset"
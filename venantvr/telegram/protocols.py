@@ -15,12 +15,38 @@ class HandlerProtocol(Protocol):
             arguments: List[Any]
     ) -> Optional[Dict[str, Any]]:
         """Traite une commande avec ses arguments.
-        
+
         Args:
             cmd: La commande à exécuter
             arguments: Les arguments de la commande
-            
+
         Returns:
             Dict avec la réponse ou None
         """
         ...
+
+
+class RuntimeProtocol(Protocol):
+    """Protocole d'un environnement d'exécution partagé par un ou plusieurs bots.
+
+    Un bot rattaché à un runtime lui délègue sa session HTTP, le démarrage de
+    sa réception et l'acheminement de ses mises à jour et messages sortants.
+    """
+
+    session: Any
+
+    def attach(self, bot: Any) -> None:
+        """Prend en charge un bot nouvellement créé."""
+        ...
+
+    def submit_update(self, bot: Any, update: Dict[str, Any]) -> None:
+        """Achemine une mise à jour reçue vers le traitement."""
+        ...
+
+    def submit_payload(self, bot: Any, payload: Dict[str, Any]) -> None:
+        """Achemine un message vers l'envoi."""
+        ...
+
+    def backlog(self, bot: Any) -> int:
+        """Retourne le nombre de mises à jour en attente de traitement."""
+        ...
@@ -0,0 +1,42 @@
+"""Limitation du débit d'envoi par bot."""
+
+import threading
+import time
+
+from venantvr.telegram.config import Config
+
+
+class RateLimiter:
+    """Seau à jetons : `rate` envois par seconde, avec une rafale de `burst` envois."""
+
+    def __init__(self, rate: float = Config.SEND_RATE_LIMIT, burst: int = Config.SEND_BURST) -> None:
+        """Initialise un seau plein.
+
+        Args:
+            rate: Nombre d'envois autorisés par seconde (0 = illimité)
+            burst: Nombre d'envois autorisés d'affilée
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Réserve un envoi et retourne le délai à respecter avant de l'effectuer."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Attend jusqu'à ce qu'un envoi soit autorisé."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
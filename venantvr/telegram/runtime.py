@@ -0,0 +1,227 @@
+"""Runtime hébergeant plusieurs bots Telegram dans un même processus."""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from venantvr.telegram.bot import TelegramBot
+from venantvr.telegram.config import Config
+from venantvr.telegram.protocols import HandlerProtocol
+
+logger = logging.getLogger(__name__)
+
+
+class BotRuntime:
+    """Héberge plusieurs tokens de bot avec un pool HTTP et des threads partagés.
+
+    Chaque bot conserve son registre de commandes, ses menus, ses métriques et
+    sa limite de débit ; seuls la session HTTP (pool de connexions) et les
+    threads de traitement et d'envoi sont mutualisés. La réception reste assurée
+    par un thread de long polling par bot, `getUpdates` étant bloquant.
+
+    Les mises à jour sont réparties entre les threads de traitement selon le bot
+    et le chat : les messages d'un même chat sont donc traités dans l'ordre, par
+    le même thread, ce qui préserve la cohérence des prompts en cours.
+    """
+
+    def __init__(self, processor_workers: int = Config.RUNTIME_PROCESSOR_WORKERS,
+                 sender_workers: int = Config.RUNTIME_SENDER_WORKERS,
+                 pool_size: int = Config.HTTP_POOL_SIZE) -> None:
+        """Initialise le runtime sans démarrer de thread.
+
+        Args:
+            processor_workers: Nombre de threads de traitement partagés
+            sender_workers: Nombre de threads d'envoi partagés
+            pool_size: Taille du pool de connexions HTTP partagé
+        """
+        self.session: Any = None
+        self._pool_size = pool_size
+        self._started = False
+        self.bots: Dict[str, TelegramBot] = {}
+        self._incoming: List[queue.Queue] = [queue.Queue() for _ in range(processor_workers)]
+        # Mises à jour de chaque bot en attente dans les files partagées
+        self._pending_updates: Dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        self._outgoing: queue.Queue = queue.Queue()
+        # Messages dont le bot a épuisé sa limite de débit : (échéance, ordre, bot, message)
+        self._deferred: List[Tuple[float, int, TelegramBot, Dict]] = []
+        self._deferred_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._sender_workers = sender_workers
+        self._senders_running = sender_workers
+        self._threads = [
+            threading.Thread(target=self._processor, args=(shard,), daemon=True, name=f"processor-{i}")
+            for i, shard in enumerate(self._incoming)
+        ]
+        self._threads += [
+            threading.Thread(target=self._sender, daemon=True, name=f"sender-{i}") for i in range(sender_workers)
+        ]
+
+    def start(self) -> "BotRuntime":
+        """Ouvre la session partagée, démarre les threads partagés et les bots hébergés.
+
+        Returns:
+            Le runtime lui-même
+        """
+        self.session = TelegramBot._create_session(self._pool_size)
+        for thread in self._threads:
+            thread.start()
+        self._started = True
+        for bot in self.bots.values():
+            bot.start()
+        logger.info(f"Runtime démarré: {len(self._incoming)} thread(s) de traitement, {self._sender_workers} d'envoi")
+        return self
+
+    def add_bot(self, bot_token: str, chat_id: str,
+                handlers: Optional[Union[List[HandlerProtocol], HandlerProtocol]] = None) -> TelegramBot:
+        """Crée un bot rattaché au runtime ; il est démarré aussitôt si le runtime l'est déjà.
+
+        Args:
+            bot_token: Token d'authentification du bot
+            chat_id: ID du chat par défaut
+            handlers: Handler(s) propres à ce bot
+
+        Returns:
+            Le bot créé
+        """
+        name = bot_token.split(":")[0]
+        if name in self.bots:
+            raise ValueError(f"Un bot nommé '{name}' est déjà hébergé par ce runtime")
+        bot = TelegramBot(bot_token, chat_id, handlers, runtime=self)
+        self.bots[name] = bot
+        if self._started:
+            bot.start()
+        return bot
+
+    @staticmethod
+    def attach(bot: TelegramBot) -> None:
+        """Démarre le thread de long polling d'un bot rattaché au runtime."""
+        thread = threading.Thread(target=bot._receiver, daemon=True, name=f"receiver-{bot.name}")
+        bot._threads.append(thread)
+        thread.start()
+
+    def _shard_for(self, bot: TelegramBot, update: Dict) -> queue.Queue:
+        """Retourne la file de traitement d'une mise à jour, stable pour un couple bot/chat."""
+        message = update.get("message") or update.get("callback_query", {}).get("message") or {}
+        key = f"{bot.name}:{message.get('chat', {}).get('id')}"
+        return self._incoming[zlib.crc32(key.encode()) % len(self._incoming)]
+
+    def submit_update(self, bot: TelegramBot, update: Dict) -> None:
+        """Met en file une mise à jour reçue par un bot."""
+        with self._pending_lock:
+            self._pending_updates[bot.name] = self._pending_updates.get(bot.name, 0) + 1
+        self._shard_for(bot, update).put((bot, update))
+
+    def backlog(self, bot: TelegramBot) -> int:
+        """Retourne le nombre de mises à jour du bot en attente dans les files de traitement partagées.
+
+        Seules les mises à jour du bot sont comptées : un bot chargé ne suspend pas
+        la réception des autres.
+        """
+        with self._pending_lock:
+            return self._pending_updates.get(bot.name, 0)
+
+    def submit_payload(self, bot: TelegramBot, payload: Dict) -> None:
+        """Met en file un message à envoyer par un bot."""
+        self._outgoing.put((bot, payload))
+
+    def _processor(self, shard: queue.Queue) -> None:
+        """Thread de traitement partagé."""
+        while True:
+            item = shard.get()
+            if item is None:
+                break
+            bot, update = item
+            bot._process_update(update)
+            with self._pending_lock:
+                self._pending_updates[bot.name] -= 1
+            shard.task_done()
+
+    def _sender(self) -> None:
+        """Thread d'envoi partagé ; chaque bot applique sa propre limite de débit.
+
+        Un thread d'envoi ne dort jamais pour le compte d'un bot : un message dont
+        le seau n'est pas prêt est mis de côté jusqu'à son échéance, et le thread
+        passe aux messages des autres bots.
+        """
+        while True:
+            item = self._next_payload()
+            if item is None:
+                break
+            bot, payload = item
+            bot._deliver(payload, throttle=False)
+
+    def _next_payload(self) -> Optional[Tuple[TelegramBot, Dict]]:
+        """Retourne le prochain message dont l'envoi est autorisé.
+
+        Returns:
+            Tuple (bot, message), ou None à l'arrêt, une fois les messages différés envoyés
+        """
+        while True:
+            with self._deferred_lock:
+                now = time.monotonic()
+                if self._deferred and self._deferred[0][0] <= now:
+                    _, _, bot, payload = heapq.heappop(self._deferred)
+                    return bot, payload
+                wait = self._deferred[0][0] - now if self._deferred else None
+                draining = self._senders_running == 0
+            if draining:
+                # Dernier thread d'envoi arrêté : il envoie les messages différés restants
+                if wait is None:
+                    return None
+                time.sleep(wait)
+                continue
+            try:
+                item = self._outgoing.get(timeout=wait)
+            except queue.Empty:
+                continue
+            self._outgoing.task_done()
+            if item is None:
+                with self._deferred_lock:
+                    self._senders_running -= 1
+                    if self._senders_running > 0:
+                        return None
+                continue
+            bot, payload = item
+            delay = bot.rate_limiter.reserve()
+            if delay <= 0:
+                return item
+            # Les réservations d'un bot sont croissantes : ses messages restent dans l'ordre
+            with self._deferred_lock:
+                heapq.heappush(self._deferred, (time.monotonic() + delay, next(self._sequence), bot, payload))
+
+    def metrics(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Retourne les métriques de chaque bot, indexées par nom de bot."""
+        return {name: bot.metrics.snapshot() for name, bot in self.bots.items()}
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête les bots hébergés puis les threads partagés, en vidant les files.
+
+        Args:
+            timeout: Durée maximale de l'arrêt en secondes (None = sans limite)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        for bot in self.bots.values():
+            bot.stop(remaining())
+        for shard in self._incoming:
+            shard.put(None)
+        for thread in self._threads[:len(self._incoming)]:
+            if thread.is_alive():
+                thread.join(remaining())
+        for _ in range(self._sender_workers):
+            self._outgoing.put(None)
+        for thread in self._threads[len(self._incoming):]:
+            if thread.is_alive():
+                thread.join(remaining())
+        if self.session is not None:
+            self.session.close()
+        logger.info("Runtime arrêté.")
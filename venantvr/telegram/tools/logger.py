@@ -1,5 +1,6 @@
+"""Logger utilitaire ; la configuration des handlers relève de `config.setup_logging`."""
+
 import logging
 
 log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-logging.basicConfig(level=logging.INFO, format=log_format)
 logger = logging.getLogger(__name__)
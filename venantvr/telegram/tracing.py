@@ -0,0 +1,120 @@
+"""Traçage échantillonné du chemin de traitement des mises à jour."""
+
+import itertools
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, TextIO, Tuple
+
+from venantvr.telegram.config import Config
+
+
+class Span:
+    """Trace d'une mise à jour, de sa réception à l'envoi des réponses.
+
+    Les événements sont conservés bruts (horodatage, étape, champs) et ne sont
+    mis en forme qu'au moment du `dump`.
+    """
+
+    __slots__ = ("trace_id", "started_at", "events", "pending")
+
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.started_at = time.perf_counter()
+        self.events: List[Tuple[float, str, Dict[str, Any]]] = []
+        self.pending = 0
+
+    def event(self, stage: str, **fields: Any) -> None:
+        """Enregistre une étape (receive, dispatch, handler, send, ...)."""
+        self.events.append((time.perf_counter(), stage, fields))
+
+    def format(self) -> str:
+        """Met en forme la trace sur une ligne."""
+        parts = [self.trace_id]
+        for at, stage, fields in self.events:
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            parts.append(f"+{(at - self.started_at) * 1000:.2f}ms {stage}" + (f" {details}" if details else ""))
+        return " | ".join(parts)
+
+
+class Tracer:
+    """Échantillonne les mises à jour et conserve leurs traces dans un tampon circulaire.
+
+    Avec `sample_rate=0` (défaut), `begin` retourne None sans rien allouer et le
+    coût par message se limite à un test. L'identifiant de corrélation voyage avec
+    la mise à jour (`update["_trace"]`) puis avec chaque réponse (`payload["_trace"]`),
+    y compris entre processus : un processus qui reçoit un identifiant inconnu
+    ouvre sa propre trace sous le même identifiant.
+    """
+
+    def __init__(self, sample_rate: float = Config.TRACE_SAMPLE_RATE, capacity: int = Config.TRACE_BUFFER_SIZE,
+                 max_active: int = Config.TRACE_MAX_ACTIVE) -> None:
+        """Initialise le traceur.
+
+        Args:
+            sample_rate: Proportion des mises à jour tracées, entre 0 et 1
+            capacity: Nombre de traces terminées conservées
+            max_active: Nombre maximal de traces en cours (les plus anciennes sont closes au-delà)
+        """
+        self.sample_rate = sample_rate
+        self._max_active = max_active
+        self._finished: Deque[Span] = deque(maxlen=capacity)
+        self._active: OrderedDict[str, Span] = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def begin(self, prefix: str) -> Optional[Span]:
+        """Ouvre une trace si la mise à jour est échantillonnée.
+
+        Args:
+            prefix: Préfixe de l'identifiant de corrélation (nom du bot, update_id, ...)
+
+        Returns:
+            La trace ouverte, ou None si la mise à jour n'est pas tracée
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        return self.adopt(f"{prefix}-{next(self._ids)}")
+
+    def adopt(self, trace_id: Optional[str]) -> Optional[Span]:
+        """Retourne la trace en cours pour un identifiant, en l'ouvrant si besoin."""
+        if trace_id is None:
+            return None
+        with self._lock:
+            span = self._active.get(trace_id)
+            if span is None:
+                span = self._active[trace_id] = Span(trace_id)
+                while len(self._active) > self._max_active:
+                    _, evicted = self._active.popitem(last=False)
+                    evicted.event("evicted")
+                    self._finished.append(evicted)
+            return span
+
+    def hold(self, span: Span) -> None:
+        """Signale une étape en cours (traitement, réponse en attente d'envoi)."""
+        with self._lock:
+            span.pending += 1
+
+    def release(self, span: Span) -> None:
+        """Signale la fin d'une étape ; la trace est close quand plus rien n'est en cours."""
+        with self._lock:
+            span.pending = max(span.pending - 1, 0)
+            if span.pending == 0 and self._active.pop(span.trace_id, None) is not None:
+                self._finished.append(span)
+
+    def dump(self, stream: Optional[TextIO] = None) -> List[str]:
+        """Met en forme les traces terminées, des plus anciennes aux plus récentes.
+
+        Args:
+            stream: Flux dans lequel écrire les traces, une par ligne (optionnel)
+
+        Returns:
+            Liste des traces mises en forme
+        """
+        with self._lock:
+            spans = list(self._finished)
+        lines = [span.format() for span in spans]
+        if stream is not None:
+            stream.writelines(f"{line}\n" for line in lines)
+        return lines